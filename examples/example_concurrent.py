@@ -5,11 +5,20 @@ Sauron Library - Concurrent Stress Test (Python)
 Exercises thread safety by running simultaneous:
 - Random IP readers (multiple threads)
 - Bulk score updaters (multiple threads)
-- Decay operations (single thread, periodic)
+- Bulk CSV loading (payloads built by a separate producer process)
+- Decay operations (periodic)
+
+Readers and writers are real threads. Bulk loading and decay are mostly
+waiting, so they are scheduled by an asyncio loop on the main thread and
+handed to a single-worker executor for the C calls.
 
 Note: Python's GIL means threads don't run truly in parallel for Python code,
 but the C library operations do release the GIL during execution, allowing
-real concurrency at the C level.
+real concurrency at the C level. Bulk CSV payloads are formatted in a forked
+process so that work does not compete for the GIL; the scoring table lives in
+the parent process, since a forked child would only get a private copy.
+
+Requires NumPy for batched random IP generation.
 
 Run:
     LD_LIBRARY_PATH=../src/.libs python3 example_concurrent.py [duration] [readers] [writers]
@@ -21,27 +30,54 @@ Copyright (c) 2024-2026, Ron Dilley
 import os
 import sys
 import time
-import random
+import queue
+import asyncio
 import threading
+import multiprocessing
 import argparse
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "python"))
 
-from sauron import Sauron, SAURON_SCORE_MIN, SAURON_SCORE_MAX
+from sauron import Sauron, SAURON_SCORE_MIN, SAURON_SCORE_MAX, BULK_CSV_LINE_MAX
+
+# Random IPs are drawn in batches of this size and handed out one at a time
+IP_POOL_SIZE = 65536
+
+# Reader/writer threads issue one batch C call per this many IPs
+BATCH_SIZE = 4096
+
+# Bulk loads carry this many CSV lines, formatted into one of BULK_SLOTS
+# fixed buffers shared with the producer process
+BULK_BATCH_SIZE = 5000
+BULK_SLOTS = 4
+BULK_SLOT_BYTES = BULK_CSV_LINE_MAX * BULK_BATCH_SIZE
+
+
+# Per-thread counter columns in ConcurrentStressTest.counters. Reads and
+# writes are counted by the library itself, see op_counts(); CHECK_READS
+# tracks the writers' validation read-backs so they can be left out
+DECAYS, READ_ERRORS, WRITE_ERRORS, CHECK_READS = range(4)
+
+# Counter row width: 8 x int64 = one 64-byte cache line per thread
+STATS_COLUMNS = 8
+CACHE_LINE = 64
+
 
+def cache_aligned_counters(rows: int) -> np.ndarray:
+    """Return a zeroed (rows, STATS_COLUMNS) int64 matrix on a cache line boundary.
 
-@dataclass
-class ThreadStats:
-    """Statistics collected by each thread."""
-    reads: int = 0
-    writes: int = 0
-    decays: int = 0
-    read_errors: int = 0
-    write_errors: int = 0
+    np.zeros() only guarantees 16-byte alignment, so over-allocate one row
+    and slice from the first 64-byte boundary; each row then fills exactly
+    one cache line.
+    """
+    buf = np.zeros((rows + 1) * STATS_COLUMNS, dtype=np.int64)
+    skip = (-buf.ctypes.data % CACHE_LINE) // buf.itemsize
+    return buf[skip:skip + rows * STATS_COLUMNS].reshape(rows, STATS_COLUMNS)
 
 
 class ConcurrentStressTest:
@@ -54,148 +90,250 @@ class ConcurrentStressTest:
         self.sauron = Sauron()
         self.running = threading.Event()
         self.running.set()
-        self.stats_lock = threading.Lock()
-        self.all_stats: List[ThreadStats] = []
-
-    def random_valid_ip(self) -> int:
-        """Generate a random non-bogon IP as uint32."""
-        while True:
-            # Generate random IP avoiding known bogon ranges
-            first_octet = random.randint(1, 223)
-            if first_octet == 127:
-                continue  # Skip loopback
-
-            ip = (first_octet << 24) | random.randint(0, 0xFFFFFF)
-
-            if not self.sauron.is_bogon(ip):
-                return ip
-
-    def reader_thread(self, thread_id: int) -> ThreadStats:
-        """Reader thread: continuously reads random IPs."""
-        stats = ThreadStats()
-        local_rng = random.Random(thread_id + time.time_ns())
-
+        # Set at shutdown so interval waits return immediately
+        self.stopping = threading.Event()
+        # Readers, writers, stats reporter and the main (asyncio) thread
+        # all start their measured work together
+        self.start_barrier = threading.Barrier(num_readers + num_writers + 2)
+        # Bulk payload producer process (fork, so it inherits this object)
+        self._mp = multiprocessing.get_context("fork")
+        self.producer_running = self._mp.Event()
+        self.producer_running.set()
+        # Payload slots cycle producer -> bulk_payloads -> loader -> free_slots,
+        # so payload bytes are never copied, pickled or reallocated
+        self.bulk_slots = self._mp.RawArray('c', BULK_SLOTS * BULK_SLOT_BYTES)
+        self.bulk_payloads = self._mp.Queue()  # (slot, length) ready to load
+        self.free_slots = self._mp.Queue()     # slot indexes ready to fill
+        # One counter row per worker thread, see run()
+        self.counters = np.zeros((0, STATS_COLUMNS), dtype=np.int64)
+        self.op_base = {'reads': 0, 'writes': 0}
+        # Clock and (reads, writes) captured when the test duration ends
+        self.deadline_ns = 0
+        self.deadline_ops = (0, 0)
+        # Per-thread IP pool and RNG, so no locking is needed
+        self._local = threading.local()
+
+    def _seed_thread_rng(self, thread_id: int) -> np.random.Generator:
+        """Give the calling thread its own PCG64 generator (no shared RNG state)."""
+        self._local.rng = np.random.default_rng(thread_id ^ time.time_ns())
+        return self._local.rng
+
+    def _refill_ip_pool(self, min_size: int = 0) -> None:
+        """Refill this thread's pool of random valid IPs in one vectorized draw."""
+        local = self._local
+        if not hasattr(local, "rng"):
+            local.rng = np.random.default_rng()
+        rng = local.rng
+
+        # Oversize large requests so loopback filtering cannot leave it short
+        size = max(IP_POOL_SIZE, 2 * min_size)
+
+        # First octet 1-223 (no 0.x or multicast/reserved), skipping loopback
+        first = rng.integers(1, 224, size=size, dtype=np.uint32)
+        rest = rng.integers(0, 1 << 24, size=size, dtype=np.uint32)
+        ips = (first << 24) | rest
+        local.ip_pool = ips[first != 127]
+        local.ip_idx = 0
+
+    def random_valid_ips(self, count: int) -> np.ndarray:
+        """Return an array of count random valid IPs from this thread's pool."""
+        local = self._local
+        if not hasattr(local, "ip_pool") or local.ip_idx + count > len(local.ip_pool):
+            self._refill_ip_pool(count)
+
+        start = local.ip_idx
+        local.ip_idx += count
+        return local.ip_pool[start:local.ip_idx]
+
+    def reader_thread(self, thread_id: int) -> None:
+        """Reader thread: continuously reads batches of random IPs."""
+        stats = self.counters[thread_id]
+        self._seed_thread_rng(thread_id)
+        scores = np.empty(BATCH_SIZE, dtype=np.int16)  # Reused every batch
+        self.start_barrier.wait()
+
+        # The try sits outside the hot loop; an error is counted and the
+        # loop re-entered
         while self.running.is_set():
             try:
-                ip = self.random_valid_ip()
-                score = self.sauron.get_u32(ip)
-
-                # Validate score is in range
-                if score < SAURON_SCORE_MIN or score > SAURON_SCORE_MAX:
-                    stats.read_errors += 1
+                while self.running.is_set():
+                    ips = self.random_valid_ips(BATCH_SIZE)
+                    self.sauron.get_batch(ips, scores)
 
-                stats.reads += 1
-
-                # Yield occasionally
-                if stats.reads % 10000 == 0:
-                    time.sleep(0)  # Yield to other threads
+                    # Validate scores are in range (count only on failure)
+                    if scores.min() < SAURON_SCORE_MIN or scores.max() > SAURON_SCORE_MAX:
+                        stats[READ_ERRORS] += np.count_nonzero(
+                            (scores < SAURON_SCORE_MIN) | (scores > SAURON_SCORE_MAX))
 
             except Exception as e:
-                stats.read_errors += 1
-
-        return stats
+                stats[READ_ERRORS] += 1
 
-    def writer_thread(self, thread_id: int) -> ThreadStats:
-        """Writer thread: continuously sets/increments random IPs."""
-        stats = ThreadStats()
-        local_rng = random.Random(thread_id + time.time_ns() + 12345)
+    def writer_thread(self, thread_id: int) -> None:
+        """Writer thread: continuously sets/increments batches of random IPs."""
+        stats = self.counters[thread_id]
+        local_rng = self._seed_thread_rng(thread_id)
+        results = np.empty(BATCH_SIZE, dtype=np.int16)  # Reused every batch
+        self.start_barrier.wait()
 
         while self.running.is_set():
             try:
-                ip = self.random_valid_ip()
-                value = local_rng.randint(-500, 500)
-                op = local_rng.randint(0, 2)
-
-                if op == 0:
-                    result = self.sauron.set_u32(ip, value)
-                elif op == 1:
-                    result = self.sauron.incr_u32(ip, value)
-                else:
-                    result = self.sauron.decr_u32(ip, abs(value))
-
-                # Validate result
-                if result < SAURON_SCORE_MIN or result > SAURON_SCORE_MAX:
-                    stats.write_errors += 1
-
-                stats.writes += 1
-
-                # Yield occasionally
-                if stats.writes % 1000 == 0:
-                    time.sleep(0)
+                while self.running.is_set():
+                    ips = self.random_valid_ips(BATCH_SIZE)
+                    values = local_rng.integers(-500, 501, size=BATCH_SIZE, dtype=np.int16)
+                    ops = local_rng.integers(0, 3, size=BATCH_SIZE, dtype=np.uint8)
+
+                    # op 0 = set, op 1 = incr, op 2 = decr (incr by -abs(value))
+                    is_set = ops == 0
+                    deltas = np.where(ops == 2, -np.abs(values), values)
+                    self.sauron.set_batch(ips[is_set], values[is_set])
+                    self.sauron.incr_batch(ips[~is_set], deltas[~is_set])
+
+                    # Validate results (count only on failure)
+                    self.sauron.get_batch(ips, results)
+                    stats[CHECK_READS] += BATCH_SIZE
+                    if results.min() < SAURON_SCORE_MIN or results.max() > SAURON_SCORE_MAX:
+                        stats[WRITE_ERRORS] += np.count_nonzero(
+                            (results < SAURON_SCORE_MIN) | (results > SAURON_SCORE_MAX))
 
             except Exception as e:
-                stats.write_errors += 1
+                stats[WRITE_ERRORS] += 1
+
+    def _slot_view(self, slot: int, length: int = BULK_SLOT_BYTES) -> memoryview:
+        """Return a writable view of the first length bytes of a payload slot."""
+        base = slot * BULK_SLOT_BYTES
+        return memoryview(self.bulk_slots).cast('B')[base:base + length]
+
+    def bulk_payload_producer(self) -> None:
+        """
+        Producer process: builds bulk-load CSV payloads.
+
+        Each batch is drawn with a handful of vectorized RNG calls and
+        formatted in C by Sauron.format_bulk_csv_into() straight into a free
+        shared payload slot, so no per-line Python strings or per-batch
+        buffers are created. It runs in a forked process and passes only
+        slot indexes to the bulk loader; the scoring table itself stays in
+        the parent process.
+        """
+        # Never block process exit on undelivered payloads
+        self.bulk_payloads.cancel_join_thread()
+
+        # Fresh RNG state rather than the forked copy of the parent's
+        rng = self._seed_thread_rng(os.getpid())
+        self._refill_ip_pool()
+
+        while self.producer_running.is_set():
+            try:
+                slot = self.free_slots.get(timeout=0.1)
+            except queue.Empty:
+                continue
 
-        return stats
+            # Generate batch of updates ("+value" lines are relative,
+            # "+-value" being a relative decrement)
+            ips = self.random_valid_ips(BULK_BATCH_SIZE)
+            values = rng.integers(-100, 101, size=BULK_BATCH_SIZE, dtype=np.int32)
+            is_relative = rng.random(BULK_BATCH_SIZE) < 0.5
 
-    def bulk_loader_thread(self, thread_id: int) -> ThreadStats:
-        """Bulk loader thread: periodically bulk loads batches."""
-        stats = ThreadStats()
-        batch_size = 5000
+            n = self.sauron.format_bulk_csv_into(
+                self._slot_view(slot), ips, values, is_relative)
+            self.bulk_payloads.put((slot, n))
 
-        while self.running.is_set():
+    async def _bulk_scheduler(self, executor, row: int) -> None:
+        """Bulk loader: periodically bulk loads prebuilt batches."""
+        stats = self.counters[row]
+
+        while True:
             try:
-                # Generate batch of updates
-                lines = []
-                for _ in range(batch_size):
-                    ip = self.random_valid_ip()
-                    value = random.randint(-100, 100)
-                    is_relative = random.random() < 0.5
-
-                    ip_str = Sauron.u32_to_ip(ip)
-                    if is_relative:
-                        if value >= 0:
-                            lines.append(f"{ip_str},+{value}")
-                        else:
-                            lines.append(f"{ip_str},+{value}")  # +negative for relative decrement
-                    else:
-                        lines.append(f"{ip_str},{value}")
-
-                data = "\n".join(lines)
-                result = self.sauron.bulk_load_string(data)
-                stats.writes += result.sets + result.updates
-
-                # Small delay between bulk loads
-                time.sleep(0.01)
+                while True:
+                    try:
+                        slot, length = self.bulk_payloads.get_nowait()
+                    except queue.Empty:
+                        await asyncio.sleep(0.01)
+                        continue
+
+                    # Hand the slot back only once the C call is over:
+                    # cancelling this task does not stop a load already
+                    # running in the worker, and the producer would
+                    # otherwise refill the slot while it is being parsed
+                    future = executor.submit(
+                        self.sauron.bulk_load_buffer, self._slot_view(slot, length))
+                    future.add_done_callback(
+                        lambda _, slot=slot: self.free_slots.put(slot))
+                    await asyncio.wrap_future(future)
+
+                    # Small delay between bulk loads
+                    await asyncio.sleep(0.01)
 
             except Exception as e:
-                stats.write_errors += 1
+                stats[WRITE_ERRORS] += 1
 
-        return stats
-
-    def decay_thread(self, thread_id: int) -> ThreadStats:
-        """Decay thread: periodically applies decay."""
-        stats = ThreadStats()
+    async def _decay_scheduler(self, executor, row: int) -> None:
+        """Decay: periodically applies decay."""
+        loop = asyncio.get_running_loop()
+        stats = self.counters[row]
         decay_interval = 0.5  # seconds
 
-        while self.running.is_set():
+        while True:
             try:
-                modified = self.sauron.decay(0.99, 1)
-                stats.decays += modified
-                time.sleep(decay_interval)
+                modified = await loop.run_in_executor(executor, self.sauron.decay, 0.99, 1)
+                stats[DECAYS] += modified
             except Exception as e:
                 pass  # Decay errors are non-fatal
-
-        return stats
+            await asyncio.sleep(decay_interval)
+
+    async def _async_main(self) -> None:
+        """Run the bulk and decay schedulers for the test duration."""
+        base = self.num_readers + self.num_writers
+        # One worker: bulk loads and decays never overlap each other
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            tasks = [
+                asyncio.create_task(self._bulk_scheduler(executor, base)),
+                asyncio.create_task(self._decay_scheduler(executor, base + 1)),
+            ]
+            await asyncio.sleep(self.duration)
+
+            # Stop the clock and the workers at the deadline; waiting for
+            # the executor below can take seconds if a decay is running
+            self.deadline_ns = time.monotonic_ns()
+            self.deadline_ops = self.op_counts()
+            self.running.clear()
+            self.stopping.set()
+            self.producer_running.clear()
+            print("\nStopping threads (an in-flight decay may still be draining)...")
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def op_counts(self):
+        """Return (reads, writes) issued since the test started.
+
+        The library counts IPs passing through batch and bulk load calls,
+        so worker loops do no per-op bookkeeping of their own. Writer
+        read-backs are subtracted, so reads are the reader threads' alone.
+        """
+        ops = self.sauron.counters()
+        check_reads = int(self.counters[:, CHECK_READS].sum())
+        return (ops['reads'] - self.op_base['reads'] - check_reads,
+                ops['writes'] - self.op_base['writes'])
 
     def stats_reporter_thread(self):
         """Periodically reports statistics."""
         interval = 1
         last_reads = 0
         last_writes = 0
-        last_time = time.time()
+        self.start_barrier.wait()
+        last_time = time.monotonic_ns()
         elapsed_sec = 0
 
         while self.running.is_set():
-            time.sleep(interval)
+            if self.stopping.wait(interval):
+                break
             elapsed_sec += interval
 
-            # Aggregate current stats
-            total_reads = sum(s.reads for s in self.all_stats)
-            total_writes = sum(s.writes for s in self.all_stats)
+            total_reads, total_writes = self.op_counts()
 
-            now = time.time()
-            dt = now - last_time
+            now = time.monotonic_ns()
+            dt = (now - last_time) / 1e9
 
             read_rate = (total_reads - last_reads) / dt / 1e6
             write_rate = (total_writes - last_writes) / dt / 1e6
@@ -208,12 +346,6 @@ class ConcurrentStressTest:
             last_writes = total_writes
             last_time = now
 
-    def run_thread_with_stats(self, target, thread_id: int):
-        """Wrapper to run thread and collect stats."""
-        stats = target(thread_id)
-        with self.stats_lock:
-            self.all_stats.append(stats)
-
     def run(self):
         """Run the concurrent stress test."""
         print("Sauron Concurrent Stress Test (Python)")
@@ -221,32 +353,44 @@ class ConcurrentStressTest:
         print(f"Duration: {self.duration} seconds")
         print(f"Reader threads: {self.num_readers}")
         print(f"Writer threads: {self.num_writers}")
-        print(f"Bulk loader threads: 1")
-        print(f"Decay thread: 1 (every 500ms)")
+        print(f"Bulk loader: asyncio task (payloads from 1 producer process)")
+        print(f"Decay: asyncio task (every 500ms)")
         print(f"Library version: {self.sauron.version}")
         print()
 
         # Pre-populate with some data
         print("Pre-populating with 100K entries...")
-        for i in range(100000):
-            ip = self.random_valid_ip()
-            self.sauron.set_u32(ip, i % 1000)
+        ips = self.random_valid_ips(100000)
+        self.sauron.set_batch(ips, (np.arange(len(ips)) % 1000).astype(np.int16))
 
         print(f"Initial count: {self.sauron.count():,}, blocks: {self.sauron.block_count()}")
+        self.op_base = self.sauron.counters()
         print()
 
+        # Start bulk payload producer before any worker threads exist,
+        # so the fork does not copy threads mid-operation
+        producer = self._mp.Process(target=self.bulk_payload_producer, daemon=True)
+        producer.start()
+        for slot in range(BULK_SLOTS):
+            self.free_slots.put(slot)
+
+        # Workers spend most of their time in C with the GIL released, so
+        # hand the GIL over less often than the 5ms default
+        old_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(0.02)
+
         # Create thread list
         threads = []
-        self.all_stats = [ThreadStats() for _ in range(self.num_readers + self.num_writers + 2)]
+        # Each row is written by exactly one thread or task (its thread_id),
+        # so no lock is needed and rows never share a cache line
+        self.counters = cache_aligned_counters(self.num_readers + self.num_writers + 2)
 
         print("Starting concurrent operations...")
         print()
-        start_time = time.time()
-
         # Start reader threads
         for i in range(self.num_readers):
             t = threading.Thread(
-                target=self._reader_wrapper,
+                target=self.reader_thread,
                 args=(i,),
                 daemon=True
             )
@@ -256,54 +400,44 @@ class ConcurrentStressTest:
         # Start writer threads
         for i in range(self.num_writers):
             t = threading.Thread(
-                target=self._writer_wrapper,
+                target=self.writer_thread,
                 args=(self.num_readers + i,),
                 daemon=True
             )
             threads.append(t)
             t.start()
 
-        # Start bulk loader thread
-        t = threading.Thread(
-            target=self._bulk_wrapper,
-            args=(self.num_readers + self.num_writers,),
-            daemon=True
-        )
-        threads.append(t)
-        t.start()
-
-        # Start decay thread
-        t = threading.Thread(
-            target=self._decay_wrapper,
-            args=(self.num_readers + self.num_writers + 1,),
-            daemon=True
-        )
-        threads.append(t)
-        t.start()
-
         # Start stats reporter
         stats_thread = threading.Thread(target=self.stats_reporter_thread, daemon=True)
         stats_thread.start()
 
-        # Run for specified duration
-        time.sleep(self.duration)
+        # Release all workers at once
+        self.start_barrier.wait()
+        start_time = time.monotonic_ns()
 
-        # Signal threads to stop
-        self.running.clear()
-        print("\nStopping threads...")
+        # Run bulk loading and decay for the specified duration, then stop
+        # all workers; the executor has finished its last C call when this
+        # returns
+        asyncio.run(self._async_main())
 
         # Wait for threads (with timeout)
         for t in threads:
             t.join(timeout=2.0)
 
-        elapsed = time.time() - start_time
+        producer.join(timeout=2.0)
+        if producer.is_alive():
+            producer.terminate()
+
+        # Rates cover the timed run only, not the shutdown drain
+        elapsed = (self.deadline_ns - start_time) / 1e9
+        sys.setswitchinterval(old_switch_interval)
 
         # Aggregate results
-        total_reads = sum(s.reads for s in self.all_stats)
-        total_writes = sum(s.writes for s in self.all_stats)
-        total_decays = sum(s.decays for s in self.all_stats)
-        read_errors = sum(s.read_errors for s in self.all_stats)
-        write_errors = sum(s.write_errors for s in self.all_stats)
+        total_reads, total_writes = self.deadline_ops
+        totals = self.counters[:, :WRITE_ERRORS + 1].sum(axis=0)
+        total_decays = int(totals[DECAYS])
+        read_errors = int(totals[READ_ERRORS])
+        write_errors = int(totals[WRITE_ERRORS])
 
         print()
         print("=" * 50)
@@ -325,26 +459,6 @@ class ConcurrentStressTest:
         self.sauron.close()
         return 0 if passed else 1
 
-    def _reader_wrapper(self, idx: int):
-        """Wrapper for reader thread to store stats."""
-        stats = self.reader_thread(idx)
-        self.all_stats[idx] = stats
-
-    def _writer_wrapper(self, idx: int):
-        """Wrapper for writer thread to store stats."""
-        stats = self.writer_thread(idx)
-        self.all_stats[idx] = stats
-
-    def _bulk_wrapper(self, idx: int):
-        """Wrapper for bulk loader thread to store stats."""
-        stats = self.bulk_loader_thread(idx)
-        self.all_stats[idx] = stats
-
-    def _decay_wrapper(self, idx: int):
-        """Wrapper for decay thread to store stats."""
-        stats = self.decay_thread(idx)
-        self.all_stats[idx] = stats
-
 
 def main():
     parser = argparse.ArgumentParser(description="Sauron Concurrent Stress Test")
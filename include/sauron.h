@@ -212,6 +212,8 @@ int sauron_delete(sauron_ctx_t *ctx, const char *ip);
 
 /**
  * Increment scores for multiple IP addresses.
+ * Entries are applied in order. Adjacent entries in the same /24 are
+ * applied under one lock acquisition, so IP-sorted input is cheapest.
  *
  * @param ctx    Scoring engine context
  * @param ips    Array of IPv4 addresses in host byte order
@@ -222,6 +224,32 @@ int sauron_delete(sauron_ctx_t *ctx, const char *ip);
 int sauron_incr_batch(sauron_ctx_t *ctx, const uint32_t *ips,
                       const int16_t *deltas, size_t count);
 
+/**
+ * Get scores for multiple IP addresses.
+ *
+ * @param ctx        Scoring engine context
+ * @param ips        Array of IPv4 addresses in host byte order
+ * @param scores_out Array to receive scores (one per IP, 0 if not found)
+ * @param count      Number of elements in arrays
+ * @return Number of scores written
+ */
+int sauron_get_batch(sauron_ctx_t *ctx, const uint32_t *ips,
+                     int16_t *scores_out, size_t count);
+
+/**
+ * Set scores for multiple IP addresses.
+ * Entries are applied in order. Adjacent entries in the same /24 are
+ * applied under one lock acquisition, so IP-sorted input is cheapest.
+ *
+ * @param ctx    Scoring engine context
+ * @param ips    Array of IPv4 addresses in host byte order
+ * @param scores Array of score values (one per IP)
+ * @param count  Number of elements in arrays
+ * @return Number of successful sets
+ */
+int sauron_set_batch(sauron_ctx_t *ctx, const uint32_t *ips,
+                     const int16_t *scores, size_t count);
+
 /****
  *
  * Bulk File Loading
@@ -267,6 +295,12 @@ typedef struct sauron_bulk_result {
  *
  * Lines starting with '#' are comments. Empty lines are skipped.
  *
+ * Regular files are memory-mapped where mmap() is available. Do not
+ * truncate or rewrite a file in place while it is being loaded: touching
+ * mapped pages past the new end of file raises SIGBUS in the calling
+ * process. Replace feeds by writing a new file and rename()-ing it over
+ * the old one, which leaves a load already in progress unaffected.
+ *
  * @param ctx      Scoring engine context
  * @param filename Path to CSV file
  * @param result   Optional pointer to receive statistics (may be NULL)
@@ -288,6 +322,72 @@ int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
 int sauron_bulk_load_buffer(sauron_ctx_t *ctx, const char *data, size_t len,
                             sauron_bulk_result_t *result);
 
+/**
+ * Per-entry filter for the _ex bulk loaders.
+ * Called for each successfully parsed line before it is applied. The
+ * filter may rewrite *value; return nonzero to apply the entry or 0 to
+ * skip it (counted in lines_skipped).
+ *
+ * @param ip          IP address (host byte order)
+ * @param value       Score or delta parsed from the line (may be modified)
+ * @param is_relative Nonzero for relative updates ("+N" / "+-N")
+ * @param user_data   Pointer passed through from the loader
+ * @return Nonzero to apply the entry, 0 to skip it
+ */
+typedef int (*sauron_bulk_filter_t)(uint32_t ip, int16_t *value,
+                                    int is_relative, void *user_data);
+
+/**
+ * Bulk load from a CSV file, passing each entry through a filter.
+ * Same as sauron_bulk_load() when filter is NULL.
+ *
+ * @param ctx       Scoring engine context
+ * @param filename  Path to CSV file
+ * @param filter    Optional per-entry filter (may be NULL)
+ * @param user_data Pointer passed to filter
+ * @param result    Optional pointer to receive statistics (may be NULL)
+ * @return SAURON_OK on success, error code on failure
+ */
+int sauron_bulk_load_ex(sauron_ctx_t *ctx, const char *filename,
+                        sauron_bulk_filter_t filter, void *user_data,
+                        sauron_bulk_result_t *result);
+
+/**
+ * Bulk load from a memory buffer, passing each entry through a filter.
+ * Same as sauron_bulk_load_buffer() when filter is NULL.
+ *
+ * @param ctx       Scoring engine context
+ * @param data      Buffer containing CSV data
+ * @param len       Length of buffer in bytes
+ * @param filter    Optional per-entry filter (may be NULL)
+ * @param user_data Pointer passed to filter
+ * @param result    Optional pointer to receive statistics (may be NULL)
+ * @return SAURON_OK on success, error code on failure
+ */
+int sauron_bulk_load_buffer_ex(sauron_ctx_t *ctx, const char *data, size_t len,
+                               sauron_bulk_filter_t filter, void *user_data,
+                               sauron_bulk_result_t *result);
+
+/**
+ * Format IP/score pairs as bulk load CSV lines.
+ * Writes one "a.b.c.d,value\n" line per entry, or "a.b.c.d,+value\n" when
+ * the entry is relative, so the output can be fed to
+ * sauron_bulk_load_buffer(). Only whole lines are written; formatting stops
+ * at the first entry that does not fit (each line needs at most 29 bytes).
+ * The output is not null-terminated.
+ *
+ * @param ips      Array of IP addresses (host byte order)
+ * @param scores   Array of score values (one per IP)
+ * @param relative Optional array of flags, nonzero = relative update (may be NULL)
+ * @param count    Number of entries
+ * @param out      Output buffer
+ * @param capacity Size of output buffer in bytes
+ * @return Number of bytes written
+ */
+size_t sauron_format_ip_score_csv(const uint32_t *ips, const int32_t *scores,
+                                  const uint8_t *relative, size_t count,
+                                  char *out, size_t capacity);
+
 /****
  *
  * Decay
@@ -336,6 +436,27 @@ uint64_t sauron_block_count(sauron_ctx_t *ctx);
  */
 size_t sauron_memory_usage(sauron_ctx_t *ctx);
 
+/**
+ * Operation counters.
+ * Counts IPs processed by batch and bulk load calls. Each call updates
+ * the counters once, so the scalar fast path is not slowed down; scalar
+ * get/set/incr calls are not counted.
+ */
+typedef struct sauron_counters {
+    uint64_t reads;     /* IPs read via sauron_get_batch() */
+    uint64_t writes;    /* IPs written via set/incr batch and bulk load */
+} sauron_counters_t;
+
+/**
+ * Get a snapshot of the operation counters.
+ * Safe to call while other threads are updating scores.
+ *
+ * @param ctx      Scoring engine context
+ * @param counters Output for the current counter values
+ * @return SAURON_OK on success, SAURON_ERR_NULL if ctx or counters is NULL
+ */
+int sauron_get_counters(sauron_ctx_t *ctx, sauron_counters_t *counters);
+
 /****
  *
  * Persistence
@@ -419,6 +540,22 @@ typedef int (*sauron_foreach_cb)(uint32_t ip, int16_t score, void *user_data);
  */
 uint64_t sauron_foreach(sauron_ctx_t *ctx, sauron_foreach_cb callback, void *user_data);
 
+/**
+ * Copy all scored IP addresses into parallel arrays.
+ * Fills ips and scores with every IP that has a non-zero score, in
+ * ascending IP order, stopping after capacity entries. Size the arrays from
+ * sauron_count(); a return value equal to capacity may mean more entries
+ * remain. Like sauron_foreach(), this does not lock, so concurrent writes
+ * may or may not be included.
+ *
+ * @param ctx      Scoring engine context
+ * @param ips      Output array of IP addresses (host byte order)
+ * @param scores   Output array of scores, one per IP
+ * @param capacity Number of entries the arrays can hold
+ * @return Number of entries written, or 0 on error
+ */
+size_t sauron_snapshot(sauron_ctx_t *ctx, uint32_t *ips, int16_t *scores, size_t capacity);
+
 /****
  *
  * Utility Functions
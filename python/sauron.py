@@ -30,11 +30,49 @@ Thread Safety:
     Each process should create its own instance or use save/load for persistence.
 """
 
+import array
 import ctypes
-import ctypes.util
 import os
+import socket
+import struct
+import sys
+import time
+import weakref
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Tuple, NamedTuple
+from typing import Optional, NamedTuple, Union
+
+# NumPy and cffi are optional and slow to import, so each is imported on
+# first use (see _numpy() and _cffi()) and cached here; None means not
+# installed. The batch API falls back to array.array without NumPy, and
+# scalar calls fall back to ctypes without cffi.
+_NOT_IMPORTED = object()
+np = _NOT_IMPORTED
+cffi = _NOT_IMPORTED
+
+
+def _numpy():
+    """Return the numpy module, or None if it is not installed."""
+    global np
+    if np is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+
+def _cffi():
+    """Return the cffi module, or None if it is not installed."""
+    global cffi
+    if cffi is _NOT_IMPORTED:
+        try:
+            import cffi as cffi_module
+        except ImportError:
+            cffi_module = None
+        cffi = cffi_module
+    return cffi
 
 
 # Error codes
@@ -48,9 +86,24 @@ SAURON_ERR_BOGON = -5
 SAURON_SCORE_MIN = -32767
 SAURON_SCORE_MAX = 32767
 
+# Decimal strings for each octet value, so u32_to_ip() does no int formatting
+_OCTETS = tuple(str(i) for i in range(256))
+
+# Raised by every engine method once close() has been called; only the
+# static IP conversion helpers and the version property need no context
+_CLOSED_MESSAGE = "Scoring engine has been closed"
+
+# Bytes reserved per line by the C CSV formatter
+BULK_CSV_LINE_MAX = 29
+
 
 def _validate_score(score: int, name: str = "score") -> int:
-    """Validate score is within int16_t range."""
+    """
+    Validate score is within int16_t range.
+
+    Hot paths inline a cheap exact-int range test and only call this to
+    accept int subclasses or to raise the error.
+    """
     if not isinstance(score, int):
         raise TypeError(f"{name} must be an integer, got {type(score).__name__}")
     if score < SAURON_SCORE_MIN or score > SAURON_SCORE_MAX:
@@ -60,6 +113,107 @@ def _validate_score(score: int, name: str = "score") -> int:
     return score
 
 
+def _parse_ipv4_lenient(ip: str) -> int:
+    """Parse dotted-decimal octets with int(), returning 0 if invalid."""
+    parts = ip.split('.')
+    if len(parts) != 4:
+        return 0
+    try:
+        octets = [int(p) for p in parts]
+        if not all(0 <= o <= 255 for o in octets):
+            return 0
+        return (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
+    except ValueError:
+        return 0
+
+
+def _require_numpy():
+    """Return the numpy module, raising if it is unavailable for the CSV formatter."""
+    np = _numpy()
+    if np is None:
+        raise SauronError("NumPy is required for CSV formatting")
+    return np
+
+
+def _as_ip_array(ips):
+    """
+    Convert ips to a contiguous uint32 array (no copy if already one).
+
+    Returns a NumPy array, or an array.array('I') when NumPy is missing.
+    Wider integer arrays are range-checked rather than truncated.
+    """
+    np = _numpy()
+    if np is not None:
+        arr = np.asarray(ips).reshape(-1)
+        if arr.dtype != np.uint32 and arr.size:
+            if arr.dtype.kind not in "iu":
+                raise TypeError(f"ips must be integers, got {arr.dtype}")
+            if arr.min() < 0 or arr.max() > 0xFFFFFFFF:
+                raise ValueError("ips must be in range 0 to 4294967295")
+        return np.ascontiguousarray(arr, dtype=np.uint32)
+    if isinstance(ips, array.array) and ips.typecode == "I":
+        return ips
+    try:
+        return array.array("I", ips)
+    except OverflowError:
+        raise ValueError("ips must be in range 0 to 4294967295") from None
+
+
+def _as_score_array(values, name: str = "scores"):
+    """
+    Convert values to a contiguous int16 array, validating range.
+
+    Returns a NumPy array, or an array.array('h') when NumPy is missing.
+    """
+    np = _numpy()
+    if np is None:
+        if isinstance(values, array.array) and values.typecode == "h":
+            arr = values
+        else:
+            try:
+                arr = array.array("h", values)
+            except OverflowError:
+                arr = None
+        if arr is None or (arr and min(arr) < SAURON_SCORE_MIN):
+            raise ValueError(
+                f"{name} must be in range {SAURON_SCORE_MIN} to {SAURON_SCORE_MAX}"
+            )
+        return arr
+    arr = np.asarray(values).reshape(-1)
+    if arr.dtype.kind not in "iu" and arr.size:
+        raise TypeError(f"{name} must be integers, got {arr.dtype}")
+    if arr.size and (arr.min() < SAURON_SCORE_MIN or arr.max() > SAURON_SCORE_MAX):
+        raise ValueError(
+            f"{name} must be in range {SAURON_SCORE_MIN} to {SAURON_SCORE_MAX}"
+        )
+    return np.ascontiguousarray(arr, dtype=np.int16)
+
+
+def _as_out_array(out, size: int):
+    """Check a caller-supplied get_batch() output buffer, or allocate one."""
+    np = _numpy()
+    if out is None:
+        if np is not None:
+            return np.empty(size, dtype=np.int16)
+        return array.array("h", bytes(2 * size))
+    if isinstance(out, array.array):
+        if out.typecode != "h" or len(out) != size:
+            raise ValueError("out must be a contiguous int16 array matching ips")
+        return out
+    if (np is None or not isinstance(out, np.ndarray) or
+            out.dtype != np.int16 or out.size != size or
+            not out.flags.c_contiguous or not out.flags.writeable):
+        raise ValueError("out must be a contiguous int16 array matching ips")
+    return out
+
+
+def _array_ptr(arr, ctype):
+    """Return a ctypes pointer to the data of a NumPy array or array.array."""
+    if isinstance(arr, array.array):
+        return ctypes.cast(arr.buffer_info()[0], ctypes.POINTER(ctype))
+    return arr.ctypes.data_as(ctypes.POINTER(ctype))
+
+
 class SauronError(Exception):
     """Base exception for Sauron errors."""
     pass
@@ -99,25 +253,105 @@ class _BulkResultStruct(ctypes.Structure):
     ]
 
 
+# Field layout of sauron_bulk_result_t, read from the struct in one call
+_BULK_RESULT_LAYOUT = struct.Struct("=5Q2d")
+assert _BULK_RESULT_LAYOUT.size == ctypes.sizeof(_BulkResultStruct)
+
+
+def _bulk_result(result: _BulkResultStruct) -> BulkLoadResult:
+    """Convert a filled _BulkResultStruct to a BulkLoadResult."""
+    return BulkLoadResult._make(_BULK_RESULT_LAYOUT.unpack_from(result))
+
+
+# sauron_bulk_filter_t: int (*)(uint32_t ip, int16_t *value, int is_relative, void *user_data)
+_BulkFilterFunc = ctypes.CFUNCTYPE(
+    ctypes.c_int, ctypes.c_uint32, ctypes.POINTER(ctypes.c_int16), ctypes.c_int, ctypes.c_void_p
+)
+_NO_BULK_FILTER = _BulkFilterFunc()  # NULL: apply every row
+
+
+class _BulkFilter:
+    """
+    Adapt a bulk load row filter to sauron_bulk_filter_t.
+
+    Accepts a Python callable fn(ip, value, is_relative) returning the value
+    to apply or None to skip the row, a compiled callback exposing .address
+    (e.g. a Numba @cfunc with the C signature, which runs without entering
+    the interpreter per row), or a _BulkFilterFunc instance. Exceptions
+    raised by a Python filter stop filtering and are re-raised afterwards.
+    """
+
+    def __init__(self, fn):
+        self.error = None
+        self._fn = None
+        if isinstance(fn, _BulkFilterFunc):
+            self.c_func = fn
+        elif hasattr(fn, "address"):
+            self.c_func = _BulkFilterFunc(fn.address)
+        elif callable(fn):
+            self._fn = fn
+            self.c_func = _BulkFilterFunc(self._call)
+        else:
+            raise TypeError(f"row_filter must be callable, got {type(fn).__name__}")
+
+    def _call(self, ip, value, is_relative, _user_data):
+        if self.error is not None:
+            return 0
+        try:
+            new_value = self._fn(ip, value[0], bool(is_relative))
+            if new_value is None:
+                return 0
+            value[0] = _validate_score(new_value, "row_filter result")
+            return 1
+        except Exception as e:  # Surfaced by check() once the C call returns
+            self.error = e
+            return 0
+
+    def check(self):
+        """Re-raise the first exception raised by a Python filter."""
+        if self.error is not None:
+            raise self.error
+
+
+class _CountersStruct(ctypes.Structure):
+    """ctypes structure for sauron_counters_t."""
+    _fields_ = [
+        ("reads", ctypes.c_uint64),
+        ("writes", ctypes.c_uint64),
+    ]
+
+
+# Resolved by the first _find_library() call; CDLL handles by path
+_LIBSAURON_PATH: Optional[str] = None
+_LIBSAURON_HANDLES = {}
+
+
 def _find_library() -> str:
-    """Find the libsauron shared library."""
+    """Find the libsauron shared library (searched once per process)."""
+    global _LIBSAURON_PATH
+    if _LIBSAURON_PATH is not None:
+        return _LIBSAURON_PATH
+
     # Check common locations
     search_paths = [
         # Development build
         Path(__file__).parent.parent / "src" / ".libs" / "libsauron.so",
         # Installed system-wide
-        "/usr/local/lib/libsauron.so",
-        "/usr/lib/libsauron.so",
-        # Use ctypes finder
+        Path("/usr/local/lib/libsauron.so"),
+        Path("/usr/lib/libsauron.so"),
     ]
 
     for path in search_paths:
         if path.exists():
-            return str(path)
+            _LIBSAURON_PATH = str(path)
+            return _LIBSAURON_PATH
 
-    # Try system library finder
-    lib_path = ctypes.util.find_library("sauron")
+    # Try system library finder (imported here: it is slow to import and
+    # only needed when the library is not in a standard location)
+    from ctypes.util import find_library
+    lib_path = find_library("sauron")
     if lib_path:
+        _LIBSAURON_PATH = lib_path
         return lib_path
 
     raise SauronError(
@@ -126,6 +360,55 @@ def _find_library() -> str:
     )
 
 
+def _load_library(library_path: str) -> ctypes.CDLL:
+    """Return the CDLL handle for library_path, loading it on first use."""
+    lib = _LIBSAURON_HANDLES.get(library_path)
+    if lib is None:
+        lib = _LIBSAURON_HANDLES.setdefault(library_path, ctypes.CDLL(library_path))
+    return lib
+
+
+# Scalar entry points called through cffi when it is installed; its call
+# dispatch is cheaper than ctypes for these small signatures
+_CFFI_SCALAR_CDEF = """
+int16_t sauron_get(void *ctx, const char *ip);
+int16_t sauron_set(void *ctx, const char *ip, int16_t score);
+int16_t sauron_incr(void *ctx, const char *ip, int16_t delta);
+int16_t sauron_decr(void *ctx, const char *ip, int16_t delta);
+int sauron_delete(void *ctx, const char *ip);
+int16_t sauron_get_u32(void *ctx, uint32_t ip);
+int16_t sauron_set_u32(void *ctx, uint32_t ip, int16_t score);
+int16_t sauron_incr_u32(void *ctx, uint32_t ip, int16_t delta);
+int16_t sauron_decr_u32(void *ctx, uint32_t ip, int16_t delta);
+int sauron_delete_u32(void *ctx, uint32_t ip);
+"""
+_CFFI_HANDLES = {}
+
+# Suffixes of the scalar entry points bound on each instance as _c_<name>
+_SCALAR_FUNCS = (
+    "get", "set", "incr", "decr", "delete",
+    "get_u32", "set_u32", "incr_u32", "decr_u32", "delete_u32",
+)
+
+
+def _raise_closed(*args):
+    """Stand-in for the scalar entry points once an engine is closed."""
+    raise SauronError(_CLOSED_MESSAGE)
+
+
+def _load_cffi_library(library_path: str):
+    """Return (ffi, lib) in cffi ABI mode for library_path, or None without cffi."""
+    cffi = _cffi()
+    if cffi is None:
+        return None
+    handle = _CFFI_HANDLES.get(library_path)
+    if handle is None:
+        ffi = cffi.FFI()
+        ffi.cdef(_CFFI_SCALAR_CDEF)
+        handle = _CFFI_HANDLES.setdefault(library_path, (ffi, ffi.dlopen(library_path)))
+    return handle
+
+
 class Sauron:
     """
     High-Speed IPv4 Scoring Engine.
@@ -152,6 +435,9 @@ class Sauron:
             s.close()
     """
 
+    # CDLL handles whose argtypes/restype have been configured
+    _configured_libs = set()
+
     def __init__(self, library_path: Optional[str] = None):
         """
         Initialize the scoring engine.
@@ -163,100 +449,171 @@ class Sauron:
         if library_path is None:
             library_path = _find_library()
 
-        self._lib = ctypes.CDLL(library_path)
-        self._setup_functions()
+        self._lib = _load_library(library_path)
+        self._setup_functions(self._lib)
 
         self._ctx = self._lib.sauron_create()
         if not self._ctx:
             raise SauronMemoryError("Failed to create scoring engine context")
+        # Destroys the context if the object is collected without close();
+        # holds only the library and the handle, never self
+        self._finalizer = weakref.finalize(self, self._lib.sauron_destroy, self._ctx)
+
+        # Bind the scalar entry points on the instance so the per-IP
+        # methods skip the library attribute lookup on every call. They
+        # take self._c_ctx, the context in the form their backend expects,
+        # and close() swaps them for _raise_closed, so the per-IP methods
+        # need no closed check of their own.
+        fast = _load_cffi_library(library_path)
+        if fast is not None:
+            ffi, funcs = fast
+            self._c_ctx = ffi.cast("void *", self._ctx)
+        else:
+            funcs = self._lib
+            self._c_ctx = self._ctx
+        for name in _SCALAR_FUNCS:
+            setattr(self, "_c_" + name, getattr(funcs, "sauron_" + name))
+
+    @classmethod
+    def _setup_functions(cls, lib: ctypes.CDLL):
+        """Configure ctypes function signatures (once per library handle)."""
+        if lib in cls._configured_libs:
+            return
 
-    def _setup_functions(self):
-        """Configure ctypes function signatures."""
         # Context management
-        self._lib.sauron_create.argtypes = []
-        self._lib.sauron_create.restype = ctypes.c_void_p
+        lib.sauron_create.argtypes = []
+        lib.sauron_create.restype = ctypes.c_void_p
 
-        self._lib.sauron_destroy.argtypes = [ctypes.c_void_p]
-        self._lib.sauron_destroy.restype = None
+        lib.sauron_destroy.argtypes = [ctypes.c_void_p]
+        lib.sauron_destroy.restype = None
 
         # Score operations (string IP)
-        self._lib.sauron_get.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-        self._lib.sauron_get.restype = ctypes.c_int16
+        lib.sauron_get.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.sauron_get.restype = ctypes.c_int16
 
-        self._lib.sauron_set.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
-        self._lib.sauron_set.restype = ctypes.c_int16
+        lib.sauron_set.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
+        lib.sauron_set.restype = ctypes.c_int16
 
-        self._lib.sauron_incr.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
-        self._lib.sauron_incr.restype = ctypes.c_int16
+        lib.sauron_incr.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
+        lib.sauron_incr.restype = ctypes.c_int16
 
-        self._lib.sauron_decr.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
-        self._lib.sauron_decr.restype = ctypes.c_int16
+        lib.sauron_decr.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int16]
+        lib.sauron_decr.restype = ctypes.c_int16
 
-        self._lib.sauron_delete.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-        self._lib.sauron_delete.restype = ctypes.c_int
+        lib.sauron_delete.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.sauron_delete.restype = ctypes.c_int
 
         # Score operations (uint32 IP) - faster
-        self._lib.sauron_get_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
-        self._lib.sauron_get_u32.restype = ctypes.c_int16
+        lib.sauron_get_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        lib.sauron_get_u32.restype = ctypes.c_int16
+
+        lib.sauron_set_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
+        lib.sauron_set_u32.restype = ctypes.c_int16
 
-        self._lib.sauron_set_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
-        self._lib.sauron_set_u32.restype = ctypes.c_int16
+        lib.sauron_incr_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
+        lib.sauron_incr_u32.restype = ctypes.c_int16
 
-        self._lib.sauron_incr_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
-        self._lib.sauron_incr_u32.restype = ctypes.c_int16
+        lib.sauron_decr_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
+        lib.sauron_decr_u32.restype = ctypes.c_int16
 
-        self._lib.sauron_decr_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int16]
-        self._lib.sauron_decr_u32.restype = ctypes.c_int16
+        lib.sauron_delete_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        lib.sauron_delete_u32.restype = ctypes.c_int
 
-        self._lib.sauron_delete_u32.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
-        self._lib.sauron_delete_u32.restype = ctypes.c_int
+        # Batch operations (uint32 IP arrays)
+        lib.sauron_get_batch.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32),
+            ctypes.POINTER(ctypes.c_int16), ctypes.c_size_t
+        ]
+        lib.sauron_get_batch.restype = ctypes.c_int
+
+        lib.sauron_set_batch.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32),
+            ctypes.POINTER(ctypes.c_int16), ctypes.c_size_t
+        ]
+        lib.sauron_set_batch.restype = ctypes.c_int
+
+        lib.sauron_incr_batch.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32),
+            ctypes.POINTER(ctypes.c_int16), ctypes.c_size_t
+        ]
+        lib.sauron_incr_batch.restype = ctypes.c_int
+
+        lib.sauron_snapshot.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32),
+            ctypes.POINTER(ctypes.c_int16), ctypes.c_size_t
+        ]
+        lib.sauron_snapshot.restype = ctypes.c_size_t
 
         # Decay
-        self._lib.sauron_decay.argtypes = [ctypes.c_void_p, ctypes.c_float, ctypes.c_int16]
-        self._lib.sauron_decay.restype = ctypes.c_uint64
+        lib.sauron_decay.argtypes = [ctypes.c_void_p, ctypes.c_float, ctypes.c_int16]
+        lib.sauron_decay.restype = ctypes.c_uint64
 
         # Statistics
-        self._lib.sauron_count.argtypes = [ctypes.c_void_p]
-        self._lib.sauron_count.restype = ctypes.c_uint64
+        lib.sauron_count.argtypes = [ctypes.c_void_p]
+        lib.sauron_count.restype = ctypes.c_uint64
+
+        lib.sauron_block_count.argtypes = [ctypes.c_void_p]
+        lib.sauron_block_count.restype = ctypes.c_uint64
 
-        self._lib.sauron_block_count.argtypes = [ctypes.c_void_p]
-        self._lib.sauron_block_count.restype = ctypes.c_uint64
+        lib.sauron_memory_usage.argtypes = [ctypes.c_void_p]
+        lib.sauron_memory_usage.restype = ctypes.c_size_t
 
-        self._lib.sauron_memory_usage.argtypes = [ctypes.c_void_p]
-        self._lib.sauron_memory_usage.restype = ctypes.c_size_t
+        lib.sauron_get_counters.argtypes = [ctypes.c_void_p, ctypes.POINTER(_CountersStruct)]
+        lib.sauron_get_counters.restype = ctypes.c_int
 
         # Persistence
-        self._lib.sauron_save.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-        self._lib.sauron_save.restype = ctypes.c_int
+        lib.sauron_save.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.sauron_save.restype = ctypes.c_int
 
-        self._lib.sauron_load.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-        self._lib.sauron_load.restype = ctypes.c_int
+        lib.sauron_load.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.sauron_load.restype = ctypes.c_int
 
         # Clear
-        self._lib.sauron_clear.argtypes = [ctypes.c_void_p]
-        self._lib.sauron_clear.restype = ctypes.c_int
+        lib.sauron_clear.argtypes = [ctypes.c_void_p]
+        lib.sauron_clear.restype = ctypes.c_int
 
         # Bulk load
-        self._lib.sauron_bulk_load.argtypes = [
+        lib.sauron_bulk_load.argtypes = [
             ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(_BulkResultStruct)
         ]
-        self._lib.sauron_bulk_load.restype = ctypes.c_int
+        lib.sauron_bulk_load.restype = ctypes.c_int
 
-        self._lib.sauron_bulk_load_buffer.argtypes = [
+        lib.sauron_bulk_load_buffer.argtypes = [
             ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.POINTER(_BulkResultStruct)
         ]
-        self._lib.sauron_bulk_load_buffer.restype = ctypes.c_int
+        lib.sauron_bulk_load_buffer.restype = ctypes.c_int
+
+        lib.sauron_bulk_load_ex.argtypes = [
+            ctypes.c_void_p, ctypes.c_char_p, _BulkFilterFunc, ctypes.c_void_p,
+            ctypes.POINTER(_BulkResultStruct)
+        ]
+        lib.sauron_bulk_load_ex.restype = ctypes.c_int
+
+        lib.sauron_bulk_load_buffer_ex.argtypes = [
+            ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t, _BulkFilterFunc,
+            ctypes.c_void_p, ctypes.POINTER(_BulkResultStruct)
+        ]
+        lib.sauron_bulk_load_buffer_ex.restype = ctypes.c_int
+
+        lib.sauron_format_ip_score_csv.argtypes = [
+            ctypes.POINTER(ctypes.c_uint32), ctypes.POINTER(ctypes.c_int32),
+            ctypes.POINTER(ctypes.c_uint8), ctypes.c_size_t,
+            ctypes.c_void_p, ctypes.c_size_t
+        ]
+        lib.sauron_format_ip_score_csv.restype = ctypes.c_size_t
 
         # Extended get (sauron_get_ex)
-        self._lib.sauron_get_ex.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.POINTER(ctypes.c_int16)]
-        self._lib.sauron_get_ex.restype = ctypes.c_int
+        lib.sauron_get_ex.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.POINTER(ctypes.c_int16)]
+        lib.sauron_get_ex.restype = ctypes.c_int
 
         # Utilities
-        self._lib.sauron_ip_to_u32.argtypes = [ctypes.c_char_p]
-        self._lib.sauron_ip_to_u32.restype = ctypes.c_uint32
+        lib.sauron_ip_to_u32.argtypes = [ctypes.c_char_p]
+        lib.sauron_ip_to_u32.restype = ctypes.c_uint32
+
+        lib.sauron_version.argtypes = []
+        lib.sauron_version.restype = ctypes.c_char_p
 
-        self._lib.sauron_version.argtypes = []
-        self._lib.sauron_version.restype = ctypes.c_char_p
+        cls._configured_libs.add(lib)
 
     def __enter__(self):
         """Context manager entry."""
@@ -274,39 +631,42 @@ class Sauron:
         Safe to call multiple times.
         """
         if self._ctx:
-            self._lib.sauron_destroy(self._ctx)
+            # Swap the entry points before clearing the context: a racing
+            # call then either raises or passes NULL, which C ignores
+            for name in _SCALAR_FUNCS:
+                setattr(self, "_c_" + name, _raise_closed)
+            self._c_ctx = None
+            self._finalizer()
             self._ctx = None
 
-    def __del__(self):
-        """Destructor - ensure cleanup."""
-        self.close()
-
     def _check_ctx(self):
         """Ensure context is valid."""
         if not self._ctx:
-            raise SauronError("Scoring engine has been closed")
+            raise SauronError(_CLOSED_MESSAGE)
 
-    # String IP operations
+    # String IP operations (str.encode() defaults to UTF-8; bytes are
+    # passed through without a copy; prefer the _u32 methods when IPs are
+    # already integers or rarely repeat)
 
-    def get(self, ip: str) -> int:
+    def get(self, ip: Union[str, bytes]) -> int:
         """
         Get the score for an IP address.
 
         Args:
-            ip: IPv4 address in dotted-decimal notation (e.g., "192.168.1.1")
+            ip: IPv4 address in dotted-decimal notation (e.g., "192.168.1.1"),
+                as str or ASCII bytes (bytes skip the per-call encode)
 
         Returns:
             Score value (-32767 to +32767), or 0 if not found
         """
-        self._check_ctx()
-        return self._lib.sauron_get(self._ctx, ip.encode('utf-8'))
+        return self._c_get(self._c_ctx, ip if type(ip) is bytes else ip.encode())
 
-    def set(self, ip: str, score: int) -> int:
+    def set(self, ip: Union[str, bytes], score: int) -> int:
         """
         Set the score for an IP address.
 
         Args:
-            ip: IPv4 address in dotted-decimal notation
+            ip: IPv4 address in dotted-decimal notation, as str or bytes
             score: Score value (-32767 to +32767)
 
         Returns:
@@ -316,18 +676,18 @@ class Sauron:
             ValueError: If score is out of range
             TypeError: If score is not an integer
         """
-        self._check_ctx()
-        _validate_score(score)
-        return self._lib.sauron_set(self._ctx, ip.encode('utf-8'), score)
+        if type(score) is not int or not -32767 <= score <= 32767:
+            _validate_score(score)
+        return self._c_set(self._c_ctx, ip if type(ip) is bytes else ip.encode(), score)
 
-    def incr(self, ip: str, delta: int) -> int:
+    def incr(self, ip: Union[str, bytes], delta: int) -> int:
         """
         Increment the score for an IP address.
 
         Uses saturating arithmetic - won't overflow past -32767/+32767.
 
         Args:
-            ip: IPv4 address in dotted-decimal notation
+            ip: IPv4 address in dotted-decimal notation, as str or bytes
             delta: Value to add (can be negative)
 
         Returns:
@@ -337,18 +697,18 @@ class Sauron:
             ValueError: If delta is out of range
             TypeError: If delta is not an integer
         """
-        self._check_ctx()
-        _validate_score(delta, "delta")
-        return self._lib.sauron_incr(self._ctx, ip.encode('utf-8'), delta)
+        if type(delta) is not int or not -32767 <= delta <= 32767:
+            _validate_score(delta, "delta")
+        return self._c_incr(self._c_ctx, ip if type(ip) is bytes else ip.encode(), delta)
 
-    def decr(self, ip: str, delta: int) -> int:
+    def decr(self, ip: Union[str, bytes], delta: int) -> int:
         """
         Decrement the score for an IP address.
 
         Equivalent to incr(ip, -delta).
 
         Args:
-            ip: IPv4 address in dotted-decimal notation
+            ip: IPv4 address in dotted-decimal notation, as str or bytes
             delta: Value to subtract
 
         Returns:
@@ -358,24 +718,24 @@ class Sauron:
             ValueError: If delta is out of range
             TypeError: If delta is not an integer
         """
-        self._check_ctx()
-        _validate_score(delta, "delta")
-        return self._lib.sauron_decr(self._ctx, ip.encode('utf-8'), delta)
+        if type(delta) is not int or not -32767 <= delta <= 32767:
+            _validate_score(delta, "delta")
+        return self._c_decr(self._c_ctx, ip if type(ip) is bytes else ip.encode(), delta)
 
-    def delete(self, ip: str) -> bool:
+    def delete(self, ip: Union[str, bytes]) -> bool:
         """
         Delete the score for an IP address (set to 0).
 
         Args:
-            ip: IPv4 address in dotted-decimal notation
+            ip: IPv4 address in dotted-decimal notation, as str or bytes
 
         Returns:
             True if successful
         """
-        self._check_ctx()
-        return self._lib.sauron_delete(self._ctx, ip.encode('utf-8')) == SAURON_OK
+        return self._c_delete(self._c_ctx, ip if type(ip) is bytes else ip.encode()) == SAURON_OK
 
-    # uint32 IP operations (faster - no string parsing)
+    # uint32 IP operations (faster - no string parsing). IPs are masked to
+    # 32 bits, so both backends wrap out-of-range values as ctypes does
 
     def get_u32(self, ip: int) -> int:
         """
@@ -389,8 +749,7 @@ class Sauron:
         Returns:
             Score value (-32767 to +32767), or 0 if not found
         """
-        self._check_ctx()
-        return self._lib.sauron_get_u32(self._ctx, ip)
+        return self._c_get_u32(self._c_ctx, ip & 0xFFFFFFFF)
 
     def set_u32(self, ip: int, score: int) -> int:
         """
@@ -407,9 +766,9 @@ class Sauron:
             ValueError: If score is out of range
             TypeError: If score is not an integer
         """
-        self._check_ctx()
-        _validate_score(score)
-        return self._lib.sauron_set_u32(self._ctx, ip, score)
+        if type(score) is not int or not -32767 <= score <= 32767:
+            _validate_score(score)
+        return self._c_set_u32(self._c_ctx, ip & 0xFFFFFFFF, score)
 
     def incr_u32(self, ip: int, delta: int) -> int:
         """
@@ -426,9 +785,9 @@ class Sauron:
             ValueError: If delta is out of range
             TypeError: If delta is not an integer
         """
-        self._check_ctx()
-        _validate_score(delta, "delta")
-        return self._lib.sauron_incr_u32(self._ctx, ip, delta)
+        if type(delta) is not int or not -32767 <= delta <= 32767:
+            _validate_score(delta, "delta")
+        return self._c_incr_u32(self._c_ctx, ip & 0xFFFFFFFF, delta)
 
     def decr_u32(self, ip: int, delta: int) -> int:
         """
@@ -445,9 +804,9 @@ class Sauron:
             ValueError: If delta is out of range
             TypeError: If delta is not an integer
         """
-        self._check_ctx()
-        _validate_score(delta, "delta")
-        return self._lib.sauron_decr_u32(self._ctx, ip, delta)
+        if type(delta) is not int or not -32767 <= delta <= 32767:
+            _validate_score(delta, "delta")
+        return self._c_decr_u32(self._c_ctx, ip & 0xFFFFFFFF, delta)
 
     def delete_u32(self, ip: int) -> bool:
         """
@@ -459,8 +818,188 @@ class Sauron:
         Returns:
             True if successful
         """
+        return self._c_delete_u32(self._c_ctx, ip & 0xFFFFFFFF) == SAURON_OK
+
+    # Batch operations (arrays of uint32 IPs - one C call per batch)
+
+    def get_batch(self, ips, out=None):
+        """
+        Get the scores for many IP addresses in a single call.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order
+            out: Optional int16 array (NumPy or array.array('h')) of the
+                 same length to receive the scores. Pass a preallocated
+                 array to avoid an allocation per call.
+
+        Returns:
+            int16 array of scores (0 where not found): a NumPy array, or
+            an array.array('h') when NumPy is not installed
+
+        Raises:
+            ValueError: If out has the wrong dtype or length
+        """
         self._check_ctx()
-        return self._lib.sauron_delete_u32(self._ctx, ip) == SAURON_OK
+        ips = _as_ip_array(ips)
+        count = len(ips)
+        out = _as_out_array(out, count)
+
+        self._lib.sauron_get_batch(
+            self._ctx,
+            _array_ptr(ips, ctypes.c_uint32),
+            _array_ptr(out, ctypes.c_int16),
+            count,
+        )
+        return out
+
+    def set_batch(self, ips, scores) -> int:
+        """
+        Set the scores for many IP addresses in a single call.
+
+        Entries are applied in order, so the last score wins for duplicate IPs.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order
+            scores: Array of score values (-32767 to +32767), one per IP
+
+        Returns:
+            Number of scores set
+
+        Raises:
+            ValueError: If a score is out of range or lengths differ
+            TypeError: If scores are not integers
+        """
+        self._check_ctx()
+        ips = _as_ip_array(ips)
+        scores = _as_score_array(scores)
+        if len(scores) != len(ips):
+            raise ValueError("ips and scores must have the same length")
+
+        return self._lib.sauron_set_batch(
+            self._ctx,
+            _array_ptr(ips, ctypes.c_uint32),
+            _array_ptr(scores, ctypes.c_int16),
+            len(ips),
+        )
+
+    def incr_batch(self, ips, deltas) -> int:
+        """
+        Increment the scores for many IP addresses in a single call.
+
+        Uses saturating arithmetic, as incr_u32(). Pass negative deltas
+        to decrement.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order
+            deltas: Array of values to add (-32767 to +32767), one per IP
+
+        Returns:
+            Number of scores incremented
+
+        Raises:
+            ValueError: If a delta is out of range or lengths differ
+            TypeError: If deltas are not integers
+        """
+        self._check_ctx()
+        ips = _as_ip_array(ips)
+        deltas = _as_score_array(deltas, "deltas")
+        if len(deltas) != len(ips):
+            raise ValueError("ips and deltas must have the same length")
+
+        return self._lib.sauron_incr_batch(
+            self._ctx,
+            _array_ptr(ips, ctypes.c_uint32),
+            _array_ptr(deltas, ctypes.c_int16),
+            len(ips),
+        )
+
+    def count_and_apply(self, ips, delta: int = 1) -> int:
+        """
+        Add delta to an IP's score once for every time it appears in ips.
+
+        Duplicates are collapsed first, so a batch of events costs one
+        incr_batch() call over the unique IPs instead of one incr_u32()
+        call per event. The resulting scores match calling
+        incr_u32(ip, delta) for each element, saturation included.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order;
+                 repeats are expected
+            delta: Value to add per occurrence (-32767 to +32767)
+
+        Returns:
+            Number of distinct IPs incremented
+
+        Raises:
+            ValueError: If delta is out of range
+            TypeError: If delta is not an integer
+        """
+        self._check_ctx()
+        _validate_score(delta, "delta")
+        ips = _as_ip_array(ips)
+        if not delta or not len(ips):
+            return 0
+
+        np = _numpy()
+        if np is not None:
+            unique, counts = np.unique(ips, return_counts=True)
+            totals = counts.astype(np.int64) * delta
+            first = np.clip(totals, SAURON_SCORE_MIN, SAURON_SCORE_MAX)
+            rest = np.clip(totals - first, SAURON_SCORE_MIN, SAURON_SCORE_MAX)
+            more = rest != 0
+            rest_ips, rest = unique[more], rest[more]
+        else:
+            tally = Counter(ips)
+            unique = array.array("I", tally)
+            totals = [n * delta for n in tally.values()]
+            first = [max(SAURON_SCORE_MIN, min(SAURON_SCORE_MAX, t)) for t in totals]
+            rest_ips = array.array("I")
+            rest = []
+            for ip, total, applied in zip(unique, totals, first):
+                if total != applied:
+                    rest_ips.append(ip)
+                    rest.append(max(SAURON_SCORE_MIN, min(SAURON_SCORE_MAX, total - applied)))
+
+        # Same-sign saturating adds compose, so a total can be applied in
+        # in-range steps; two steps span the whole score range
+        applied = self.incr_batch(unique, first)
+        if len(rest_ips):
+            self.incr_batch(rest_ips, rest)
+        return applied
+
+    def snapshot(self):
+        """
+        Copy every non-zero score out as a pair of parallel arrays.
+
+        Entries come back in ascending IP order. The arrays can be
+        transformed in bulk (e.g. with NumPy) and written back with
+        set_batch(ips, scores). Writers running during the copy may or
+        may not be reflected in the result.
+
+        Returns:
+            Tuple (ips, scores) of uint32 and int16 arrays: NumPy arrays,
+            or array.array('I') and array.array('h') when NumPy is not
+            installed
+        """
+        self._check_ctx()
+        np = _numpy()
+        while True:
+            capacity = self._lib.sauron_count(self._ctx) + 1024
+            if np is not None:
+                ips = np.empty(capacity, dtype=np.uint32)
+                scores = np.empty(capacity, dtype=np.int16)
+            else:
+                ips = array.array("I", bytes(4 * capacity))
+                scores = array.array("h", bytes(2 * capacity))
+            n = self._lib.sauron_snapshot(
+                self._ctx,
+                _array_ptr(ips, ctypes.c_uint32),
+                _array_ptr(scores, ctypes.c_int16),
+                capacity,
+            )
+            # A full buffer means writers added entries mid-copy; retry
+            if n < capacity:
+                return ips[:n], scores[:n]
 
     # Decay
 
@@ -527,6 +1066,24 @@ class Sauron:
             'memory': self.memory_usage(),
         }
 
+    def counters(self) -> dict:
+        """
+        Get operation counters for batch and bulk load calls.
+
+        Counts IPs read by get_batch() and written by set_batch(),
+        incr_batch() and the bulk loaders. Scalar calls are not counted.
+
+        Returns:
+            Dict with 'reads' and 'writes' keys
+        """
+        self._check_ctx()
+        counters = _CountersStruct()
+        self._lib.sauron_get_counters(self._ctx, ctypes.byref(counters))
+        return {
+            'reads': counters.reads,
+            'writes': counters.writes,
+        }
+
     # Clear
 
     def clear(self) -> None:
@@ -601,7 +1158,7 @@ class Sauron:
 
     # Bulk loading
 
-    def bulk_load(self, filename: str) -> BulkLoadResult:
+    def bulk_load(self, filename: str, row_filter=None) -> BulkLoadResult:
         """
         Bulk load IP score changes from a CSV file.
 
@@ -618,8 +1175,21 @@ class Sauron:
             192.168.1.2,+50
             10.0.0.1,-25
 
+        A row_filter sees each parsed row before it is applied and may
+        rewrite or drop it. It is either a Python callable
+        fn(ip, value, is_relative) returning the value to apply (or None to
+        skip the row), or a compiled C callback with the signature
+        int(uint32 ip, int16 *value, int is_relative, void *user_data) such
+        as a Numba @cfunc, which avoids a Python call per row. Skipped rows
+        are counted in lines_skipped.
+
+        The file is memory-mapped. Truncating or rewriting it in place while
+        it loads raises SIGBUS and kills the process; replace feed files by
+        writing a new file and renaming it over the old one.
+
         Args:
             filename: Path to CSV file
+            row_filter: Optional per-row filter (see above)
 
         Returns:
             BulkLoadResult with statistics and timing
@@ -628,54 +1198,195 @@ class Sauron:
             SauronIOError: If file cannot be read
         """
         self._check_ctx()
+        cb = _BulkFilter(row_filter) if row_filter is not None else None
+        c_filter = cb.c_func if cb is not None else _NO_BULK_FILTER
         result = _BulkResultStruct()
-        ret = self._lib.sauron_bulk_load(
-            self._ctx, filename.encode('utf-8'), ctypes.byref(result)
+        ret = self._lib.sauron_bulk_load_ex(
+            self._ctx, filename.encode('utf-8'), c_filter, None, ctypes.byref(result)
         )
         if ret != SAURON_OK:
             raise SauronIOError(f"Failed to bulk load: {filename}")
+        if cb is not None:
+            cb.check()
+
+        return _bulk_result(result)
+
+    def bulk_load_parallel(self, filenames, max_workers: Optional[int] = None) -> BulkLoadResult:
+        """
+        Bulk load several CSV files concurrently, one thread per file.
+
+        ctypes releases the GIL for the duration of each sauron_bulk_load()
+        call, so shards (e.g. one file per /8) load in parallel and only
+        contend on the per-block locks they share. Entries for the same IP
+        in different files are applied in no particular order.
+
+        Args:
+            filenames: Paths to CSV files, in the bulk_load() format
+            max_workers: Maximum number of loader threads (default: one
+                         per file, capped at the CPU count)
+
+        Returns:
+            BulkLoadResult summed over all files; elapsed_seconds and
+            lines_per_second cover the whole parallel load
+
+        Raises:
+            SauronIOError: If any file cannot be read
+        """
+        self._check_ctx()
+        filenames = list(filenames)
+        if not filenames:
+            return BulkLoadResult(0, 0, 0, 0, 0, 0.0, 0.0)
+        if max_workers is None:
+            max_workers = min(len(filenames), os.cpu_count() or 1)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(self.bulk_load, filenames))
+        elapsed = time.perf_counter() - start
 
+        lines = sum(r.lines_processed for r in results)
         return BulkLoadResult(
-            lines_processed=result.lines_processed,
-            lines_skipped=result.lines_skipped,
-            sets=result.sets,
-            updates=result.updates,
-            parse_errors=result.parse_errors,
-            elapsed_seconds=result.elapsed_seconds,
-            lines_per_second=result.lines_per_second,
+            lines_processed=lines,
+            lines_skipped=sum(r.lines_skipped for r in results),
+            sets=sum(r.sets for r in results),
+            updates=sum(r.updates for r in results),
+            parse_errors=sum(r.parse_errors for r in results),
+            elapsed_seconds=elapsed,
+            lines_per_second=lines / elapsed if elapsed > 0 else 0.0,
         )
 
-    def bulk_load_string(self, data: str) -> BulkLoadResult:
+    def bulk_load_string(self, data: str, row_filter=None) -> BulkLoadResult:
         """
         Bulk load IP score changes from a string buffer.
 
-        Same format as bulk_load() but reads from a string.
+        Same format as bulk_load() but reads from a string. Bytes-like data
+        is passed to bulk_load_buffer() as is, without decoding.
 
         Args:
-            data: CSV data as string
+            data: CSV data as string (or bytes-like)
+            row_filter: Optional per-row filter, as for bulk_load()
+
+        Returns:
+            BulkLoadResult with statistics and timing
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        return self.bulk_load_buffer(data, row_filter)
+
+    def bulk_load_buffer(self, data, row_filter=None) -> BulkLoadResult:
+        """
+        Bulk load IP score changes from a bytes-like buffer.
+
+        Same format as bulk_load(). The C parser reads bytes, bytearray and
+        writable memoryview data in place, without an intermediate copy
+        (read-only buffers other than bytes are copied once).
+
+        Args:
+            data: CSV data as bytes, bytearray or memoryview
+            row_filter: Optional per-row filter, as for bulk_load()
 
         Returns:
             BulkLoadResult with statistics and timing
         """
         self._check_ctx()
-        encoded = data.encode('utf-8')
+        cb = _BulkFilter(row_filter) if row_filter is not None else None
+        c_filter = cb.c_func if cb is not None else _NO_BULK_FILTER
+        if isinstance(data, bytes):
+            buf, length = data, len(data)
+        else:
+            view = memoryview(data).cast('B')
+            length = view.nbytes
+            if view.readonly or length == 0:
+                buf = view.tobytes()
+            else:
+                buf = (ctypes.c_char * length).from_buffer(view)
+
         result = _BulkResultStruct()
-        ret = self._lib.sauron_bulk_load_buffer(
-            self._ctx, encoded, len(encoded), ctypes.byref(result)
+        ret = self._lib.sauron_bulk_load_buffer_ex(
+            self._ctx, buf, length, c_filter, None, ctypes.byref(result)
         )
         if ret != SAURON_OK:
             raise SauronError("Failed to bulk load from buffer")
+        if cb is not None:
+            cb.check()
 
-        return BulkLoadResult(
-            lines_processed=result.lines_processed,
-            lines_skipped=result.lines_skipped,
-            sets=result.sets,
-            updates=result.updates,
-            parse_errors=result.parse_errors,
-            elapsed_seconds=result.elapsed_seconds,
-            lines_per_second=result.lines_per_second,
+        return _bulk_result(result)
+
+    def format_bulk_csv_into(self, out, ips, scores, relative=None) -> int:
+        """
+        Format IP/score arrays as bulk load CSV lines into a buffer.
+
+        Writes "a.b.c.d,score" lines, or "a.b.c.d,+score" for relative
+        entries, in the format accepted by bulk_load_buffer(). Only whole
+        lines are written; reserve BULK_CSV_LINE_MAX bytes per entry.
+
+        Args:
+            out: Writable buffer (e.g. bytearray) to receive the CSV data
+            ips: Array of IPv4 addresses as uint32 in host byte order
+            scores: Array of values (-32767 to +32767), one per IP
+            relative: Optional array of booleans, True = relative update
+
+        Returns:
+            Number of bytes written to out
+
+        Raises:
+            SauronError: If NumPy is not installed or the engine is closed
+            ValueError: If a score is out of range or lengths differ
+            TypeError: If scores are not integers or out is not writable
+        """
+        self._check_ctx()
+        np = _require_numpy()
+        ips = _as_ip_array(ips)
+        scores = _as_score_array(scores).astype(np.int32)
+        if scores.size != ips.size:
+            raise ValueError("ips and scores must have the same length")
+        rel_ptr = None
+        if relative is not None:
+            relative = np.ascontiguousarray(relative, dtype=np.uint8).reshape(-1)
+            if relative.size != ips.size:
+                raise ValueError("ips and relative must have the same length")
+            rel_ptr = relative.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8))
+
+        view = memoryview(out)
+        if view.readonly:
+            raise TypeError("out must be a writable buffer")
+        if view.nbytes == 0:
+            return 0
+        buf = (ctypes.c_char * view.nbytes).from_buffer(view)
+        return self._lib.sauron_format_ip_score_csv(
+            ips.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32)),
+            scores.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            rel_ptr,
+            ips.size,
+            ctypes.addressof(buf),
+            view.nbytes,
         )
 
+    def format_bulk_csv(self, ips, scores, relative=None) -> bytes:
+        """
+        Format IP/score arrays as bulk load CSV data.
+
+        Same as format_bulk_csv_into() but returns a new bytes object.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order
+            scores: Array of values (-32767 to +32767), one per IP
+            relative: Optional array of booleans, True = relative update
+
+        Returns:
+            CSV data as bytes
+
+        Raises:
+            SauronError: If NumPy is not installed or the engine is closed
+        """
+        self._check_ctx()
+        np = _require_numpy()
+        out = bytearray(BULK_CSV_LINE_MAX * np.size(ips))
+        n = self.format_bulk_csv_into(out, ips, scores, relative)
+        return bytes(out[:n])
+
     # Utilities
 
     @staticmethod
@@ -689,17 +1400,40 @@ class Sauron:
         Returns:
             IP address as uint32 in host byte order, or 0 if invalid
         """
-        # Local implementation to avoid loading library just for this
-        parts = ip.split('.')
-        if len(parts) != 4:
-            return 0
+        # Local implementation to avoid loading library just for this.
+        # inet_pton() handles canonical addresses in C; anything it rejects
+        # goes through the lenient parser (e.g. leading zeros are decimal).
         try:
-            octets = [int(p) for p in parts]
-            if not all(0 <= o <= 255 for o in octets):
-                return 0
-            return (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
-        except ValueError:
-            return 0
+            return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+        except (OSError, ValueError):
+            return _parse_ipv4_lenient(ip)
+
+    @staticmethod
+    def ip_to_u32_many(ips):
+        """
+        Convert a sequence of IPv4 strings to a uint32 array.
+
+        Args:
+            ips: Iterable of IPv4 addresses in dotted-decimal notation
+
+        Returns:
+            uint32 array in host byte order (0 for invalid entries): a
+            NumPy array, or an array.array('I') when NumPy is not installed
+        """
+        pton = socket.inet_pton
+        af = socket.AF_INET
+        ips = ips if isinstance(ips, (list, tuple)) else list(ips)
+        try:
+            packed = b"".join([pton(af, ip) for ip in ips])
+        except (OSError, ValueError):
+            return _as_ip_array([Sauron.ip_to_u32(ip) for ip in ips])
+        np = _numpy()
+        if np is not None:
+            return np.frombuffer(packed, dtype=">u4").astype(np.uint32)
+        arr = array.array("I", packed)
+        if sys.byteorder == "little":
+            arr.byteswap()
+        return arr
 
     @staticmethod
     def u32_to_ip(ip: int) -> str:
@@ -712,7 +1446,24 @@ class Sauron:
         Returns:
             IPv4 address in dotted-decimal notation
         """
-        return f"{(ip >> 24) & 0xFF}.{(ip >> 16) & 0xFF}.{(ip >> 8) & 0xFF}.{ip & 0xFF}"
+        return (f"{_OCTETS[(ip >> 24) & 0xFF]}.{_OCTETS[(ip >> 16) & 0xFF]}."
+                f"{_OCTETS[(ip >> 8) & 0xFF]}.{_OCTETS[ip & 0xFF]}")
+
+    @staticmethod
+    def u32_to_ip_many(ips) -> list:
+        """
+        Convert an array of uint32 IPs to IPv4 strings.
+
+        Args:
+            ips: Array of IPv4 addresses as uint32 in host byte order
+
+        Returns:
+            List of IPv4 addresses in dotted-decimal notation
+        """
+        octets = _OCTETS
+        return [f"{octets[ip >> 24]}.{octets[(ip >> 16) & 0xFF]}."
+                f"{octets[(ip >> 8) & 0xFF]}.{octets[ip & 0xFF]}"
+                for ip in _as_ip_array(ips).tolist()]
 
     @property
     def version(self) -> str:
@@ -33,7 +33,7 @@
 #include "mem.h"
 #include "util.h"
 
-/* SIMD support for vectorized decay */
+/* SIMD support for vectorized decay and bulk IP parsing */
 #ifdef HAVE_AVX2
 #include <immintrin.h>
 #endif
@@ -56,6 +56,18 @@
 /* Cache line alignment for performance */
 #define CACHE_LINE_SIZE 64
 
+/* Read prefetch hint (no-op where unsupported) */
+#if defined(__GNUC__) || defined(__clang__)
+#define SAURON_PREFETCH(addr) __builtin_prefetch((addr), 0, 3)
+#else
+#define SAURON_PREFETCH(addr) ((void)(addr))
+#endif
+
+/* Lookahead distances (in IPs) for the staged prefetch in sauron_get_batch() */
+#define PREFETCH_FAR    64
+#define PREFETCH_MID    32
+#define PREFETCH_NEAR   16
+
 /* Spinlock stripe count for allocation locks */
 #define ALLOC_LOCK_STRIPES 256
 
@@ -142,6 +154,10 @@ struct sauron_ctx {
     _Atomic(uint64_t) score_count;    /* Total non-zero scores */
     _Atomic(uint64_t) block_count;    /* Total allocated /24 blocks */
     _Atomic(size_t) memory_used;      /* Total memory allocated */
+
+    /* Operation counters, bumped once per batch or bulk load call */
+    _Atomic(uint64_t) batch_reads;    /* IPs read via sauron_get_batch() */
+    _Atomic(uint64_t) batch_writes;   /* IPs written via batch/bulk load */
 };
 
 /* Internal helper functions */
@@ -378,6 +394,8 @@ sauron_ctx_t *sauron_create(void)
     atomic_store(&ctx->score_count, 0);
     atomic_store(&ctx->block_count, 0);
     atomic_store(&ctx->memory_used, sizeof(sauron_ctx_t) + BITMAP_BYTES);
+    atomic_store(&ctx->batch_reads, 0);
+    atomic_store(&ctx->batch_writes, 0);
 
     ctx->initialized = TRUE;
 
@@ -636,21 +654,149 @@ int sauron_delete(sauron_ctx_t *ctx, const char *ip)
 
 /* Batch Operations */
 
+/**
+ * Apply a run of consecutive batch entries that fall in the same /24 block
+ * under a single acquisition of the block lock. Returns the index of the
+ * first entry not in the run.
+ */
+static size_t write_block_run(sauron_ctx_t *ctx, cidr_block_t *block,
+                              const uint32_t *ips, const int16_t *values,
+                              size_t start, size_t count, int relative)
+{
+    uint32_t prefix24 = ip_to_prefix24(ips[start]);
+    int32_t active_delta = 0;
+    uint8_t host_idx;
+    int16_t old_score, new_score;
+    size_t i;
+
+    SAURON_LOCK(&block->lock);
+
+    for (i = start; i < count && ip_to_prefix24(ips[i]) == prefix24; i++) {
+        host_idx = ip_to_host_idx(ips[i]);
+        old_score = atomic_load_explicit(&block->scores[host_idx], memory_order_relaxed);
+        new_score = relative ? saturating_add(old_score, values[i]) : values[i];
+        if (new_score == old_score)
+            continue;
+        atomic_store_explicit(&block->scores[host_idx], new_score, memory_order_release);
+        active_delta += (new_score != 0) - (old_score != 0);
+    }
+
+    /* Update active counts once for the whole run */
+    if (active_delta > 0) {
+        atomic_fetch_add_explicit(&block->active_count, (uint32_t)active_delta, memory_order_relaxed);
+        atomic_fetch_add_explicit(&ctx->score_count, (uint64_t)active_delta, memory_order_relaxed);
+    } else if (active_delta < 0) {
+        atomic_fetch_sub_explicit(&block->active_count, (uint32_t)-active_delta, memory_order_relaxed);
+        atomic_fetch_sub_explicit(&ctx->score_count, (uint64_t)-active_delta, memory_order_relaxed);
+    }
+
+    SAURON_UNLOCK(&block->lock);
+
+    return i;
+}
+
+/**
+ * Shared body of sauron_set_batch() and sauron_incr_batch().
+ * Entries are applied in order; adjacent entries in the same /24 share
+ * one lock acquisition.
+ */
+static int write_batch(sauron_ctx_t *ctx, const uint32_t *ips,
+                       const int16_t *values, size_t count, int relative)
+{
+    cidr_block_t *block;
+    size_t i = 0;
+
+    while (i < count) {
+        /* A zero delta is a no-op and must not allocate a block */
+        if (relative && values[i] == 0) {
+            i++;
+            continue;
+        }
+
+        block = get_or_alloc_block(ctx, ips[i]);
+        if (block == NULL) {
+            i++;  /* OOM - skip entry as "no change" */
+            continue;
+        }
+
+        i = write_block_run(ctx, block, ips, values, i, count, relative);
+    }
+
+    atomic_fetch_add_explicit(&ctx->batch_writes, (uint64_t)count, memory_order_relaxed);
+    return (int)count;
+}
+
 int sauron_incr_batch(sauron_ctx_t *ctx, const uint32_t *ips,
                       const int16_t *deltas, size_t count)
+{
+    if (ctx == NULL || ips == NULL || deltas == NULL)
+        return 0;
+
+    return write_batch(ctx, ips, deltas, count, TRUE);
+}
+
+/*
+ * Staged prefetch for batch lookups. Each level of the lookup depends on a
+ * pointer loaded from the level above, so each stage only touches memory
+ * an earlier stage already prefetched for the same IP.
+ */
+static inline void prefetch_lookup_far(sauron_ctx_t *ctx, uint32_t ip)
+{
+    SAURON_PREFETCH(&ctx->bitmap[ip_to_prefix24(ip) / 8]);
+    SAURON_PREFETCH(&ctx->block_ptrs[ip_to_prefix16(ip)]);
+}
+
+static inline void prefetch_lookup_mid(sauron_ctx_t *ctx, uint32_t ip)
+{
+    _Atomic(cidr_block_t *) *block_arr = ctx->block_ptrs[ip_to_prefix16(ip)];
+
+    if (block_arr != NULL)
+        SAURON_PREFETCH(&block_arr[ip_to_block_idx(ip)]);
+}
+
+static inline void prefetch_lookup_near(sauron_ctx_t *ctx, uint32_t ip)
+{
+    _Atomic(cidr_block_t *) *block_arr = ctx->block_ptrs[ip_to_prefix16(ip)];
+    cidr_block_t *block;
+
+    if (block_arr == NULL)
+        return;
+    block = atomic_load_explicit(&block_arr[ip_to_block_idx(ip)], memory_order_relaxed);
+    if (block != NULL)
+        SAURON_PREFETCH(&block->scores[ip_to_host_idx(ip)]);
+}
+
+int sauron_get_batch(sauron_ctx_t *ctx, const uint32_t *ips,
+                     int16_t *scores_out, size_t count)
 {
     size_t i;
-    int success_count = 0;
 
-    if (ctx == NULL || ips == NULL || deltas == NULL)
+    if (ctx == NULL || ips == NULL || scores_out == NULL)
         return 0;
 
     for (i = 0; i < count; i++) {
-        sauron_incr_u32(ctx, ips[i], deltas[i]);
-        success_count++;
+        /* Overlap the dependent loads of upcoming IPs with this lookup */
+        if (i + PREFETCH_FAR < count)
+            prefetch_lookup_far(ctx, ips[i + PREFETCH_FAR]);
+        if (i + PREFETCH_MID < count)
+            prefetch_lookup_mid(ctx, ips[i + PREFETCH_MID]);
+        if (i + PREFETCH_NEAR < count)
+            prefetch_lookup_near(ctx, ips[i + PREFETCH_NEAR]);
+
+        scores_out[i] = sauron_get_u32(ctx, ips[i]);
     }
 
-    return success_count;
+    atomic_fetch_add_explicit(&ctx->batch_reads, (uint64_t)count, memory_order_relaxed);
+    return (int)count;
+}
+
+int sauron_set_batch(sauron_ctx_t *ctx, const uint32_t *ips,
+                     const int16_t *scores, size_t count)
+{
+    if (ctx == NULL || ips == NULL || scores == NULL)
+        return 0;
+
+    return write_batch(ctx, ips, scores, count, FALSE);
 }
 
 /* Bulk File Loading */
@@ -659,34 +805,101 @@ int sauron_incr_batch(sauron_ctx_t *ctx, const uint32_t *ips,
 #define BULK_READ_BUFFER_SIZE 65536
 #define BULK_LINE_MAX 64
 
-static int parse_bulk_line(const char *line, uint32_t *ip_out,
-                           int16_t *value_out, int *is_relative_out)
+#ifdef HAVE_AVX2
+/**
+ * Parse a canonical dotted-quad at p with SSE. Classifies 16 bytes at once,
+ * takes the IP length and dot positions from the digit/dot masks, and
+ * combines each 1-3 digit octet without a per-character loop. Requires 16
+ * readable bytes at p; the IP itself must end before end.
+ *
+ * @return Length of the IP text, or 0 if the scalar parser must decide
+ */
+static size_t parse_bulk_ip_simd(const char *p, const char *end, uint32_t *ip_out)
+{
+    const __m128i text = _mm_loadu_si128((const __m128i *)p);
+    const __m128i digits = _mm_sub_epi8(text, _mm_set1_epi8('0'));
+    const __m128i is_digit = _mm_cmpeq_epi8(_mm_min_epu8(digits, _mm_set1_epi8(9)), digits);
+    const __m128i is_dot = _mm_cmpeq_epi8(text, _mm_set1_epi8('.'));
+    uint32_t dot_mask = (uint32_t)_mm_movemask_epi8(is_dot);
+    uint32_t span = (uint32_t)_mm_movemask_epi8(is_digit) | dot_mask;
+    uint8_t d[19];
+    size_t len;
+    uint32_t start = 0;
+    uint32_t ip = 0;
+    uint32_t octet;
+    int bad = 0;
+    int i;
+
+    /* IP text ends at the first byte that is neither digit nor dot */
+    len = (size_t)__builtin_ctz(~span);
+    if (len > 15 || len > (size_t)(end - p))
+        return 0;
+    if (len < (size_t)(end - p) && p[len] != ',' && p[len] != ' ' && p[len] != '\t')
+        return 0;
+    dot_mask &= (1u << len) - 1;
+    if (__builtin_popcount(dot_mask) != 3)
+        return 0;
+
+    /* Dots become 0, so a 1-digit octet reads 0 for its tens digit; d[0..2]
+     * pads the first octet the same way. Only the hundreds digit can reach
+     * into the previous octet and needs the length check. */
+    memset(d, 0, 3);
+    _mm_storeu_si128((__m128i *)(d + 3), _mm_and_si128(digits, is_digit));
+    for (i = 0; i < 4; i++) {
+        uint32_t stop = (i < 3) ? (uint32_t)__builtin_ctz(dot_mask) : (uint32_t)len;
+        uint32_t n = stop - start;
+        const uint8_t *o = d + 3 + stop;
+
+        octet = o[-1] + 10u * o[-2] + (n >= 3) * 100u * o[-3];
+        bad |= (n - 1) > 2 || octet > 255;
+        ip = (ip << 8) | octet;
+        dot_mask &= dot_mask - 1;
+        start = stop + 1;
+    }
+    if (bad)
+        return 0;
+
+    *ip_out = ip;
+    return len;
+}
+#endif /* HAVE_AVX2 */
+
+/**
+ * Parse the IP field of a bulk line starting at p. limit is the end of
+ * readable memory, which may lie past the line end, and lets the SIMD
+ * parser load a full vector.
+ *
+ * @return Position after the IP, or NULL if invalid
+ */
+static const char *parse_bulk_ip(const char *p, const char *end,
+                                 const char *limit, uint32_t *ip_out)
 {
-    const char *p = line;
     uint32_t ip = 0;
     uint32_t octet = 0;
     int dots = 0;
     int digits = 0;
-    int32_t value;
-    int is_relative = 0;
-    int negative = 0;
 
-    /* Skip leading whitespace */
-    while (*p == ' ' || *p == '\t')
-        p++;
+#ifdef HAVE_AVX2
+    if (limit - p >= 16) {
+        size_t len = parse_bulk_ip_simd(p, end, ip_out);
+        if (len != 0)
+            return p + len;
+    }
+#else
+    (void)limit;
+#endif
 
-    /* Parse IP address */
-    while (*p != '\0' && *p != ',') {
+    while (p < end && *p != ',') {
         if (*p >= '0' && *p <= '9') {
             octet = octet * 10 + (*p - '0');
             digits++;
             if (octet > 255)
-                return 0;
+                return NULL;
         } else if (*p == '.') {
             if (digits == 0)
-                return 0;  /* Empty octet */
+                return NULL;  /* Empty octet */
             if (dots >= 3)
-                return 0;
+                return NULL;
             ip = (ip << 8) | octet;
             octet = 0;
             digits = 0;
@@ -695,25 +908,53 @@ static int parse_bulk_line(const char *line, uint32_t *ip_out,
             /* Allow whitespace before comma */
             break;
         } else {
-            return 0;  /* Invalid character */
+            return NULL;  /* Invalid character */
         }
         p++;
     }
 
     /* Validate IP */
     if (dots != 3 || digits == 0)
+        return NULL;
+
+    *ip_out = (ip << 8) | octet;
+    return p;
+}
+
+/**
+ * Parse one "IP,CHANGE" line of len bytes. The line does not need to be
+ * null-terminated, so buffers are parsed in place without copying. limit
+ * marks the end of readable memory after the line (at least line + len).
+ */
+static int parse_bulk_line(const char *line, size_t len, const char *limit,
+                           uint32_t *ip_out, int16_t *value_out,
+                           int *is_relative_out)
+{
+    const char *p = line;
+    const char *end = line + len;
+    uint32_t ip;
+    int32_t value;
+    int is_relative = 0;
+    int negative = 0;
+
+    /* Skip leading whitespace */
+    while (p < end && (*p == ' ' || *p == '\t'))
+        p++;
+
+    /* Parse IP address */
+    p = parse_bulk_ip(p, end, limit, &ip);
+    if (p == NULL)
         return 0;
-    ip = (ip << 8) | octet;
 
     /* Skip whitespace and find comma */
-    while (*p == ' ' || *p == '\t')
+    while (p < end && (*p == ' ' || *p == '\t'))
         p++;
-    if (*p != ',')
+    if (p == end || *p != ',')
         return 0;
     p++;
 
     /* Skip whitespace after comma */
-    while (*p == ' ' || *p == '\t')
+    while (p < end && (*p == ' ' || *p == '\t'))
         p++;
 
     /* Check for + prefix (relative update) or - prefix (negative value OR relative)
@@ -725,26 +966,26 @@ static int parse_bulk_line(const char *line, uint32_t *ip_out,
      * Simplified: Only "+" prefix means relative. "-N" is SET to -N.
      * For relative decrements, use the separate incr API or "+-50" format (future).
      */
-    if (*p == '+') {
+    if (p < end && *p == '+') {
         is_relative = 1;
         p++;
         /* Check for "+-N" format for relative negative */
-        if (*p == '-') {
+        if (p < end && *p == '-') {
             negative = 1;
             p++;
         }
-    } else if (*p == '-') {
+    } else if (p < end && *p == '-') {
         /* Bare minus = negative absolute value, NOT relative */
         negative = 1;
         p++;
     }
 
     /* Parse value */
-    if (*p < '0' || *p > '9')
+    if (p == end || *p < '0' || *p > '9')
         return 0;  /* No digits */
 
     value = 0;
-    while (*p >= '0' && *p <= '9') {
+    while (p < end && *p >= '0' && *p <= '9') {
         value = value * 10 + (*p - '0');
         if (value > 32767)
             value = 32767;  /* Saturate */
@@ -755,11 +996,11 @@ static int parse_bulk_line(const char *line, uint32_t *ip_out,
         value = -value;
 
     /* Skip trailing whitespace */
-    while (*p == ' ' || *p == '\t' || *p == '\r' || *p == '\n')
+    while (p < end && (*p == ' ' || *p == '\t' || *p == '\r' || *p == '\n'))
         p++;
 
     /* Should be at end of meaningful content */
-    if (*p != '\0' && *p != '#')  /* Allow comments */
+    if (p < end && *p != '#')  /* Allow comments */
         return 0;
 
     *ip_out = ip;
@@ -775,8 +1016,40 @@ static double get_time_seconds(void)
     return ts.tv_sec + ts.tv_nsec / 1e9;
 }
 
-int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
-                     sauron_bulk_result_t *result)
+#ifdef HAVE_SYS_MMAN_H
+/**
+ * Map a bulk load file read-only for parsing in place. Returns NULL if the
+ * file is empty, not a regular file or cannot be mapped, in which case the
+ * caller reads it line by line instead. A file truncated while mapped
+ * raises SIGBUS on access past its new end; sauron_bulk_load() documents
+ * this for callers.
+ */
+static const char *map_bulk_file(FILE *fp, size_t *len_out)
+{
+    struct stat st;
+    void *map;
+
+    if (fstat(fileno(fp), &st) != 0 || !S_ISREG(st.st_mode) ||
+        st.st_size <= 0 || (uint64_t)st.st_size > SIZE_MAX)
+        return NULL;
+
+    map = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fileno(fp), 0);
+    if (map == MAP_FAILED)
+        return NULL;
+
+#if defined(HAVE_MADVISE) && defined(MADV_SEQUENTIAL)
+    /* Single forward pass: let the kernel read ahead aggressively */
+    madvise(map, (size_t)st.st_size, MADV_SEQUENTIAL);
+#endif
+
+    *len_out = (size_t)st.st_size;
+    return (const char *)map;
+}
+#endif
+
+int sauron_bulk_load_ex(sauron_ctx_t *ctx, const char *filename,
+                        sauron_bulk_filter_t filter, void *user_data,
+                        sauron_bulk_result_t *result)
 {
     FILE *fp;
     char *line_buffer;
@@ -795,6 +1068,24 @@ int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
     if (fp == NULL)
         return SAURON_ERR_IO;
 
+#ifdef HAVE_SYS_MMAN_H
+    /* Regular files are mapped and parsed in place like a buffer, which
+     * skips the stdio copy and lets the parser read whole vectors */
+    {
+        size_t map_len;
+        const char *map = map_bulk_file(fp, &map_len);
+
+        if (map != NULL) {
+            int ret;
+
+            fclose(fp);
+            ret = sauron_bulk_load_buffer_ex(ctx, map, map_len, filter, user_data, result);
+            munmap((void *)map, map_len);
+            return ret;
+        }
+    }
+#endif
+
     /* Allocate line buffer */
     line_buffer = (char *)malloc(line_buffer_size);
     if (line_buffer == NULL) {
@@ -816,12 +1107,23 @@ int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
             continue;
 
         /* Parse line */
-        if (!parse_bulk_line(line_buffer, &ip, &value, &is_relative)) {
+        if (!parse_bulk_line(line_buffer, (size_t)line_len, line_buffer + line_len,
+                             &ip, &value, &is_relative)) {
             stats.parse_errors++;
             stats.lines_skipped++;
             continue;
         }
 
+        /* Let the caller rewrite or drop the entry */
+        if (filter != NULL) {
+            if (!filter(ip, &value, is_relative, user_data)) {
+                stats.lines_skipped++;
+                continue;
+            }
+            if (value < SAURON_SCORE_MIN)
+                value = SAURON_SCORE_MIN;
+        }
+
         /* Apply change */
         if (is_relative) {
             sauron_incr_u32(ctx, ip, value);
@@ -844,17 +1146,26 @@ int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
     else
         stats.lines_per_second = 0.0;
 
+    atomic_fetch_add_explicit(&ctx->batch_writes, stats.sets + stats.updates,
+                              memory_order_relaxed);
+
     if (result != NULL)
         *result = stats;
 
     return SAURON_OK;
 }
 
-int sauron_bulk_load_buffer(sauron_ctx_t *ctx, const char *data, size_t len,
-                            sauron_bulk_result_t *result)
+int sauron_bulk_load(sauron_ctx_t *ctx, const char *filename,
+                     sauron_bulk_result_t *result)
+{
+    return sauron_bulk_load_ex(ctx, filename, NULL, NULL, result);
+}
+
+int sauron_bulk_load_buffer_ex(sauron_ctx_t *ctx, const char *data, size_t len,
+                               sauron_bulk_filter_t filter, void *user_data,
+                               sauron_bulk_result_t *result)
 {
-    const char *p, *end, *line_start;
-    char line_buffer[BULK_LINE_MAX];
+    const char *p, *end, *line_start, *nl;
     size_t line_len;
     uint32_t ip;
     int16_t value;
@@ -871,36 +1182,40 @@ int sauron_bulk_load_buffer(sauron_ctx_t *ctx, const char *data, size_t len,
     end = data + len;
 
     while (p < end) {
-        /* Find line start and end */
+        /* Find line end (memchr is vectorized in libc) */
         line_start = p;
-        while (p < end && *p != '\n')
-            p++;
+        nl = (const char *)memchr(p, '\n', (size_t)(end - p));
+        if (nl == NULL)
+            nl = end;
 
-        line_len = (size_t)(p - line_start);
-        if (line_len >= BULK_LINE_MAX)
-            line_len = BULK_LINE_MAX - 1;
-
-        /* Copy line to buffer and null-terminate */
-        memcpy(line_buffer, line_start, line_len);
-        line_buffer[line_len] = '\0';
+        line_len = (size_t)(nl - line_start);
 
         /* Skip past newline */
-        if (p < end && *p == '\n')
-            p++;
+        p = (nl < end) ? nl + 1 : end;
 
         stats.lines_processed++;
 
         /* Skip empty lines and comments */
-        if (line_len == 0 || line_buffer[0] == '#')
+        if (line_len == 0 || line_start[0] == '#')
             continue;
 
-        /* Parse line */
-        if (!parse_bulk_line(line_buffer, &ip, &value, &is_relative)) {
+        /* Parse line in place */
+        if (!parse_bulk_line(line_start, line_len, end, &ip, &value, &is_relative)) {
             stats.parse_errors++;
             stats.lines_skipped++;
             continue;
         }
 
+        /* Let the caller rewrite or drop the entry */
+        if (filter != NULL) {
+            if (!filter(ip, &value, is_relative, user_data)) {
+                stats.lines_skipped++;
+                continue;
+            }
+            if (value < SAURON_SCORE_MIN)
+                value = SAURON_SCORE_MIN;
+        }
+
         /* Apply change */
         if (is_relative) {
             sauron_incr_u32(ctx, ip, value);
@@ -920,12 +1235,129 @@ int sauron_bulk_load_buffer(sauron_ctx_t *ctx, const char *data, size_t len,
     else
         stats.lines_per_second = 0.0;
 
+    atomic_fetch_add_explicit(&ctx->batch_writes, stats.sets + stats.updates,
+                              memory_order_relaxed);
+
     if (result != NULL)
         *result = stats;
 
     return SAURON_OK;
 }
 
+int sauron_bulk_load_buffer(sauron_ctx_t *ctx, const char *data, size_t len,
+                            sauron_bulk_result_t *result)
+{
+    return sauron_bulk_load_buffer_ex(ctx, data, len, NULL, NULL, result);
+}
+
+/* Longest formatted line: "255.255.255.255,+-2147483648\n" */
+#define BULK_FORMAT_LINE_MAX 29
+
+/* Two-digit ASCII pairs "00".."99" for integer formatting */
+static const char digit_pairs[201] =
+    "00010203040506070809"
+    "10111213141516171819"
+    "20212223242526272829"
+    "30313233343536373839"
+    "40414243444546474849"
+    "50515253545556575859"
+    "60616263646566676869"
+    "70717273747576777879"
+    "80818283848586878889"
+    "90919293949596979899";
+
+/* Write one octet (0-255) without leading zeros, return chars written */
+static inline size_t format_octet(char *out, uint32_t v)
+{
+    if (v >= 100) {
+        uint32_t hi = (v * 41) >> 12;  /* v / 100 for v < 1000 */
+        uint32_t lo = v - hi * 100;
+        out[0] = (char)('0' + hi);
+        out[1] = digit_pairs[lo * 2];
+        out[2] = digit_pairs[lo * 2 + 1];
+        return 3;
+    }
+    if (v >= 10) {
+        out[0] = digit_pairs[v * 2];
+        out[1] = digit_pairs[v * 2 + 1];
+        return 2;
+    }
+    out[0] = (char)('0' + v);
+    return 1;
+}
+
+/* Write a signed decimal integer, return chars written */
+static inline size_t format_int(char *out, int32_t value)
+{
+    char tmp[16];
+    char *t = tmp + sizeof(tmp);
+    uint32_t v;
+    size_t n = 0;
+
+    if (value < 0) {
+        out[n++] = '-';
+        v = 0u - (uint32_t)value;
+    } else {
+        v = (uint32_t)value;
+    }
+
+    while (v >= 100) {
+        uint32_t r = v % 100;
+        v /= 100;
+        t -= 2;
+        t[0] = digit_pairs[r * 2];
+        t[1] = digit_pairs[r * 2 + 1];
+    }
+    if (v >= 10) {
+        t -= 2;
+        t[0] = digit_pairs[v * 2];
+        t[1] = digit_pairs[v * 2 + 1];
+    } else {
+        *--t = (char)('0' + v);
+    }
+
+    memcpy(out + n, t, (size_t)(tmp + sizeof(tmp) - t));
+    return n + (size_t)(tmp + sizeof(tmp) - t);
+}
+
+size_t sauron_format_ip_score_csv(const uint32_t *ips, const int32_t *scores,
+                                  const uint8_t *relative, size_t count,
+                                  char *out, size_t capacity)
+{
+    size_t i;
+    size_t pos = 0;
+    char *p;
+    uint32_t ip;
+
+    if (ips == NULL || scores == NULL || out == NULL)
+        return 0;
+
+    for (i = 0; i < count; i++) {
+        /* Only emit whole lines */
+        if (capacity - pos < BULK_FORMAT_LINE_MAX)
+            break;
+
+        p = out + pos;
+        ip = ips[i];
+        p += format_octet(p, ip >> 24);
+        *p++ = '.';
+        p += format_octet(p, (ip >> 16) & 0xFF);
+        *p++ = '.';
+        p += format_octet(p, (ip >> 8) & 0xFF);
+        *p++ = '.';
+        p += format_octet(p, ip & 0xFF);
+        *p++ = ',';
+        if (relative != NULL && relative[i])
+            *p++ = '+';
+        p += format_int(p, scores[i]);
+        *p++ = '\n';
+
+        pos = (size_t)(p - out);
+    }
+
+    return pos;
+}
+
 /* Decay */
 
 #ifdef HAVE_AVX2
@@ -1108,6 +1540,16 @@ size_t sauron_memory_usage(sauron_ctx_t *ctx)
     return atomic_load_explicit(&ctx->memory_used, memory_order_relaxed);
 }
 
+int sauron_get_counters(sauron_ctx_t *ctx, sauron_counters_t *counters)
+{
+    if (ctx == NULL || counters == NULL)
+        return SAURON_ERR_NULL;
+
+    counters->reads = atomic_load_explicit(&ctx->batch_reads, memory_order_relaxed);
+    counters->writes = atomic_load_explicit(&ctx->batch_writes, memory_order_relaxed);
+    return SAURON_OK;
+}
+
 /* Persistence */
 
 /* Archive file format:
@@ -1531,6 +1973,52 @@ uint64_t sauron_foreach(sauron_ctx_t *ctx, sauron_foreach_cb callback, void *use
     return count;
 }
 
+size_t sauron_snapshot(sauron_ctx_t *ctx, uint32_t *ips, int16_t *scores, size_t capacity)
+{
+    size_t count = 0;
+    int prefix16, block_idx, host_idx;
+    _Atomic(cidr_block_t *) *block_arr;
+    cidr_block_t *block;
+    uint32_t prefix24;
+    int16_t score;
+
+    if (ctx == NULL || ips == NULL || scores == NULL)
+        return 0;
+
+    for (prefix16 = 0; prefix16 < PREFIX16_COUNT; prefix16++) {
+        block_arr = ctx->block_ptrs[prefix16];
+        if (block_arr == NULL)
+            continue;
+
+        for (block_idx = 0; block_idx < BLOCKS_PER_16; block_idx++) {
+            prefix24 = ((uint32_t)prefix16 << 8) | (uint32_t)block_idx;
+            if (!bitmap_test(ctx, prefix24))
+                continue;
+
+            block = atomic_load_explicit(&block_arr[block_idx], memory_order_acquire);
+            if (block == NULL ||
+                atomic_load_explicit(&block->active_count, memory_order_relaxed) == 0)
+                continue;
+
+            /* Unlocked, like sauron_foreach(): concurrent writes may or may
+             * not be included */
+            for (host_idx = 0; host_idx < SCORES_PER_BLOCK; host_idx++) {
+                score = atomic_load_explicit(&block->scores[host_idx], memory_order_relaxed);
+                if (score == 0)
+                    continue;
+                if (count == capacity)
+                    return count;
+
+                ips[count] = (prefix24 << 8) | (uint32_t)host_idx;
+                scores[count] = score;
+                count++;
+            }
+        }
+    }
+
+    return count;
+}
+
 const char *sauron_version(void)
 {
     return SAURON_VERSION_STRING;
@@ -627,6 +627,24 @@ static void test_foreach_api(void)
     if (counter == 2) PASS();  /* Stopped after 2 */
     else FAIL("should stop at 2");
 
+    TEST("sauron_snapshot copies entries in IP order");
+    {
+        uint32_t snap_ips[8];
+        int16_t snap_scores[8];
+        sauron_set(ctx, "9.0.0.1", -7);
+        size_t n = sauron_snapshot(ctx, snap_ips, snap_scores, 8);
+        if (n == 6 && snap_ips[0] == 0x09000001 && snap_scores[0] == -7 &&
+            snap_ips[5] == 0x0A000005 && snap_scores[5] == 500) PASS();
+        else FAIL("snapshot mismatch");
+
+        TEST("sauron_snapshot stops at capacity");
+        n = sauron_snapshot(ctx, snap_ips, snap_scores, 2);
+        if (n == 2 && snap_ips[1] == 0x0A000001 &&
+            sauron_snapshot(NULL, snap_ips, snap_scores, 8) == 0 &&
+            sauron_snapshot(ctx, NULL, snap_scores, 8) == 0) PASS();
+        else FAIL("capacity not respected");
+    }
+
     TEST("sauron_foreach on empty context");
     sauron_clear(ctx);
     counter = 0;
@@ -692,8 +710,127 @@ static void test_audit_fixes(void)
     sauron_destroy(ctx);
 }
 
+/* Batch Operation Tests */
+
+static void test_batch_operations(void)
+{
+    printf("\nBatch Operation Tests\n");
+    printf("-" "-------------------------------------------------\n");
+
+    sauron_ctx_t *ctx = sauron_create();
+    uint32_t ips[4] = { 0x0A000001, 0x0A000002, 0x0A000101, 0x0A000001 };
+    int16_t scores[4] = { 100, -200, 300, 400 };
+    int16_t deltas[4] = { 10, 20, 30, 40 };
+    int16_t out[4];
+    int ret;
+
+    TEST("sauron_set_batch sets all entries");
+    ret = sauron_set_batch(ctx, ips, scores, 3);
+    if (ret == 3 && sauron_get_u32(ctx, 0x0A000001) == 100 &&
+        sauron_get_u32(ctx, 0x0A000002) == -200 &&
+        sauron_get_u32(ctx, 0x0A000101) == 300) PASS();
+    else FAIL("scores not set");
+
+    TEST("sauron_set_batch applies duplicates in order");
+    ret = sauron_set_batch(ctx, ips, scores, 4);
+    if (ret == 4 && sauron_get_u32(ctx, 0x0A000001) == 400) PASS();
+    else FAIL("last write should win");
+
+    TEST("sauron_get_batch reads all entries");
+    ret = sauron_get_batch(ctx, ips, out, 4);
+    if (ret == 4 && out[0] == 400 && out[1] == -200 &&
+        out[2] == 300 && out[3] == 400) PASS();
+    else FAIL("wrong scores");
+
+    TEST("sauron_get_batch returns 0 for missing IPs");
+    uint32_t missing[2] = { 0x08080808, 0x0A0000FF };
+    ret = sauron_get_batch(ctx, missing, out, 2);
+    if (ret == 2 && out[0] == 0 && out[1] == 0) PASS();
+    else FAIL("should be 0");
+
+    TEST("sauron_incr_batch increments all entries");
+    ret = sauron_incr_batch(ctx, ips, deltas, 4);
+    if (ret == 4 && sauron_get_u32(ctx, 0x0A000001) == 450 &&
+        sauron_get_u32(ctx, 0x0A000002) == -180 &&
+        sauron_get_u32(ctx, 0x0A000101) == 330) PASS();
+    else FAIL("wrong scores");
+
+    TEST("Batch runs within one /24 keep counts exact");
+    {
+        sauron_ctx_t *rctx = sauron_create();
+        uint32_t run_ips[256];
+        int16_t run_vals[256];
+        int i;
+        for (i = 0; i < 256; i++) {
+            run_ips[i] = 0x0B000000 | (uint32_t)i;
+            run_vals[i] = (int16_t)(i + 1);
+        }
+        sauron_set_batch(rctx, run_ips, run_vals, 256);
+        for (i = 0; i < 256; i++)
+            run_vals[i] = (int16_t)((i % 2) ? 0 : -(i + 1));
+        sauron_incr_batch(rctx, run_ips, run_vals, 256);  /* Zero even hosts */
+        if (sauron_count(rctx) == 128 && sauron_block_count(rctx) == 1 &&
+            sauron_get_u32(rctx, 0x0B000000) == 0 &&
+            sauron_get_u32(rctx, 0x0B000001) == 2 &&
+            sauron_get_u32(rctx, 0x0B0000FF) == 256) PASS();
+        else FAIL("count or scores wrong");
+
+        TEST("sauron_incr_batch zero delta does not allocate");
+        run_ips[0] = 0x0C000001;
+        run_vals[0] = 0;
+        sauron_incr_batch(rctx, run_ips, run_vals, 1);
+        if (sauron_block_count(rctx) == 1) PASS();
+        else FAIL("block allocated for zero delta");
+        sauron_destroy(rctx);
+    }
+
+    TEST("Batch operations with zero count");
+    if (sauron_set_batch(ctx, ips, scores, 0) == 0 &&
+        sauron_get_batch(ctx, ips, out, 0) == 0) PASS();
+    else FAIL("should return 0");
+
+    TEST("Batch operations with NULL arguments");
+    if (sauron_get_batch(NULL, ips, out, 4) == 0 &&
+        sauron_get_batch(ctx, NULL, out, 4) == 0 &&
+        sauron_get_batch(ctx, ips, NULL, 4) == 0 &&
+        sauron_set_batch(NULL, ips, scores, 4) == 0 &&
+        sauron_set_batch(ctx, ips, NULL, 4) == 0) PASS();
+    else FAIL("should return 0");
+
+    TEST("Batch operation counters");
+    {
+        sauron_counters_t counters;
+        sauron_ctx_t *cctx = sauron_create();
+        sauron_set_batch(cctx, ips, scores, 4);
+        sauron_incr_batch(cctx, ips, scores, 2);
+        sauron_get_batch(cctx, ips, out, 4);
+        sauron_get_u32(cctx, ips[0]);  /* Scalar calls are not counted */
+        const char *counted = "10.0.0.1,5\n10.0.0.2,+5\n";
+        sauron_bulk_load_buffer(cctx, counted, strlen(counted), NULL);
+        if (sauron_get_counters(cctx, &counters) == SAURON_OK &&
+            counters.reads == 4 && counters.writes == 8 &&
+            sauron_get_counters(NULL, &counters) == SAURON_ERR_NULL &&
+            sauron_get_counters(cctx, NULL) == SAURON_ERR_NULL) PASS();
+        else FAIL("counter mismatch");
+        sauron_destroy(cctx);
+    }
+
+    sauron_destroy(ctx);
+}
+
 /* Bulk Load Tests */
 
+/* Drops 10.0.1.0/24 and doubles every other value; counts calls */
+static int double_except_net1(uint32_t ip, int16_t *value, int is_relative, void *user_data)
+{
+    (void)is_relative;
+    (*(int *)user_data)++;
+    if ((ip & 0xFFFFFF00) == 0x0A000100)
+        return 0;
+    *value = (int16_t)(*value * 2);
+    return 1;
+}
+
 static void test_bulk_load(void)
 {
     printf("\nBulk Load Tests\n");
@@ -788,6 +925,95 @@ static void test_bulk_load(void)
         sauron_get(ctx, "10.0.0.3") == -50) PASS();
     else FAIL("buffer load failed");
 
+    /* Buffer lines are parsed in place: no terminator or length limit */
+    TEST("Bulk load buffer without trailing newline");
+    sauron_clear(ctx);
+    {
+        const char *unterminated = "10.0.0.1,7\r\n10.0.0.2,+9   # feed entry with a long trailing "
+                                   "comment that is well past sixty-four bytes\n10.0.0.3,-3";
+        /* Length excludes the final "3": the parser must stop at "-" and reject it */
+        ret = sauron_bulk_load_buffer(ctx, unterminated, strlen(unterminated) - 1, &result);
+        if (ret == SAURON_OK && result.lines_processed == 3 && result.parse_errors == 1 &&
+            sauron_get(ctx, "10.0.0.1") == 7 &&
+            sauron_get(ctx, "10.0.0.2") == 9 &&
+            sauron_get(ctx, "10.0.0.3") == 0) PASS();
+        else FAIL("in-place parse mismatch");
+    }
+
+    /* Long buffers take the vector IP parser; odd forms must still match
+     * the scalar rules */
+    TEST("Bulk load buffer IP forms");
+    sauron_clear(ctx);
+    {
+        const char *forms = "255.255.255.255,1\n0001.2.3.4,2\n10.0.0.9 ,3\n"
+                            "1.2.3.256,4\n1..2.3,5\n10.0.0.8x,6\n1.2.3.4.5,7\n"
+                            "10.0.0.7,8\n                                \n";
+        ret = sauron_bulk_load_buffer(ctx, forms, strlen(forms), &result);
+        if (ret == SAURON_OK && result.sets == 4 && result.parse_errors == 5 &&
+            sauron_get_u32(ctx, 0xFFFFFFFF) == 1 &&
+            sauron_get_u32(ctx, 0x01020304) == 2 &&
+            sauron_get(ctx, "10.0.0.9") == 3 &&
+            sauron_get(ctx, "10.0.0.8") == 0 &&
+            sauron_get(ctx, "10.0.0.7") == 8) PASS();
+        else FAIL("IP parse mismatch");
+    }
+
+    /* Filtered buffer load */
+    TEST("Bulk load buffer with filter");
+    sauron_clear(ctx);
+    {
+        const char *filtered = "10.0.0.1,100\n10.0.1.1,5\n10.0.0.2,+-20\nbogus\n";
+        int calls = 0;
+        ret = sauron_bulk_load_buffer_ex(ctx, filtered, strlen(filtered),
+                                         double_except_net1, &calls, &result);
+        if (ret == SAURON_OK && calls == 3 && result.lines_skipped == 2 &&
+            result.parse_errors == 1 && result.sets == 1 && result.updates == 1 &&
+            sauron_get(ctx, "10.0.0.1") == 200 &&
+            sauron_get(ctx, "10.0.1.1") == 0 &&
+            sauron_get(ctx, "10.0.0.2") == -40) PASS();
+        else FAIL("filter not applied");
+    }
+
+    /* Test CSV formatter round trip */
+    TEST("Format CSV lines");
+    {
+        uint32_t fmt_ips[4] = {0x0A000001, 0xC0A80102, 0xFFFFFFFF, 0x01020304};
+        int32_t fmt_scores[4] = {7, 250, -32767, -5};
+        uint8_t fmt_rel[4] = {0, 1, 0, 1};
+        const char *expect = "10.0.0.1,7\n192.168.1.2,+250\n"
+                             "255.255.255.255,-32767\n1.2.3.4,+-5\n";
+        char fmt_buf[4 * 29];
+        size_t n = sauron_format_ip_score_csv(fmt_ips, fmt_scores, fmt_rel, 4,
+                                              fmt_buf, sizeof(fmt_buf));
+        if (n == strlen(expect) && memcmp(fmt_buf, expect, n) == 0) PASS();
+        else FAIL("formatted output mismatch");
+
+        TEST("Format CSV stops at whole lines");
+        n = sauron_format_ip_score_csv(fmt_ips, fmt_scores, NULL, 4,
+                                       fmt_buf, 29);
+        if (n == strlen("10.0.0.1,7\n")) PASS();
+        else FAIL("partial line written");
+
+        TEST("Format CSV then bulk load");
+        sauron_clear(ctx);
+        sauron_set_u32(ctx, 0x01020304, 10);
+        n = sauron_format_ip_score_csv(fmt_ips, fmt_scores, fmt_rel, 4,
+                                       fmt_buf, sizeof(fmt_buf));
+        ret = sauron_bulk_load_buffer(ctx, fmt_buf, n, &result);
+        if (ret == SAURON_OK && result.sets == 2 && result.updates == 2 &&
+            sauron_get_u32(ctx, 0x0A000001) == 7 &&
+            sauron_get_u32(ctx, 0xC0A80102) == 250 &&
+            sauron_get_u32(ctx, 0xFFFFFFFF) == -32767 &&
+            sauron_get_u32(ctx, 0x01020304) == 5) PASS();
+        else FAIL("round trip mismatch");
+
+        TEST("Format CSV with NULL arrays");
+        if (sauron_format_ip_score_csv(NULL, fmt_scores, NULL, 4, fmt_buf, sizeof(fmt_buf)) == 0 &&
+            sauron_format_ip_score_csv(fmt_ips, NULL, NULL, 4, fmt_buf, sizeof(fmt_buf)) == 0 &&
+            sauron_format_ip_score_csv(fmt_ips, fmt_scores, NULL, 4, NULL, sizeof(fmt_buf)) == 0) PASS();
+        else FAIL("should return 0");
+    }
+
     /* Test NULL handling */
     TEST("Bulk load with NULL context");
     ret = sauron_bulk_load(NULL, "/tmp/sauron_bulk_test.csv", NULL);
@@ -801,6 +1027,18 @@ static void test_bulk_load(void)
     ret = sauron_bulk_load(ctx, "/nonexistent/file.csv", NULL);
     if (ret != SAURON_OK) PASS(); else FAIL("should fail");
 
+    /* Non-regular files are read line by line instead of mapped */
+    TEST("Bulk load from a character device");
+    ret = sauron_bulk_load(ctx, "/dev/null", &result);
+    if (ret == SAURON_OK && result.lines_processed == 0) PASS();
+    else FAIL("device load failed");
+
+    TEST("Bulk load file with NULL filter");
+    sauron_clear(ctx);
+    ret = sauron_bulk_load_ex(ctx, "/tmp/sauron_bulk_test.csv", NULL, NULL, &result);
+    if (ret == SAURON_OK && result.sets + result.updates > 0) PASS();
+    else FAIL("NULL filter should load normally");
+
     /* Test performance reporting */
     TEST("Performance metrics populated");
     ret = sauron_bulk_load(ctx, "/tmp/sauron_bulk_test.csv", &result);
@@ -831,6 +1069,7 @@ int main(void)
     test_new_apis();
     test_foreach_api();
     test_audit_fixes();
+    test_batch_operations();
     test_bulk_load();
 
     printf("\n=================================================\n");
@@ -8,12 +8,21 @@ Tests the Python ctypes wrapper for libsauron.
 import sys
 import os
 import time
+import array
+import ctypes
 import tempfile
+import types
 
 # Add parent directory to path for development testing
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from python import Sauron, SauronError, SauronIOError
+from python import sauron as sauron_module
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def test_basic_operations():
@@ -43,6 +52,14 @@ def test_basic_operations():
         score = s.get("192.168.1.100")
         assert score == 0, f"Expected 0 after delete, got {score}"
 
+        # bytes IPs are accepted directly
+        assert s.set(b"192.168.1.101", 75) == 0
+        assert s.incr(b"192.168.1.101", 5) == 80
+        assert s.decr(b"192.168.1.101", 10) == 70
+        assert s.get("192.168.1.101") == 70
+        assert s.get(b"192.168.1.101") == 70
+        assert s.delete(b"192.168.1.101") is True
+
     print("PASS")
 
 
@@ -61,6 +78,20 @@ def test_saturation():
         score = s.incr("10.0.0.2", -100)
         assert score == -32767, f"Expected -32767, got {score}"
 
+        # Out-of-range and non-integer values are rejected, not wrapped
+        for bad, error in ((32768, ValueError), (-32768, ValueError),
+                           (1.5, TypeError), ("1", TypeError)):
+            for call in (lambda: s.set_u32(1, bad), lambda: s.incr("10.0.0.3", bad)):
+                try:
+                    call()
+                    assert False, f"{bad!r} should have raised {error.__name__}"
+                except error:
+                    pass
+
+        # int subclasses are still accepted
+        assert s.set_u32(1, True) == 0
+        assert s.get_u32(1) == 1
+
     print("PASS")
 
 
@@ -83,6 +114,349 @@ def test_u32_operations():
         score_str = s.get("172.16.0.50")
         assert score_str == 300, f"String get expected 300, got {score_str}"
 
+    # Out-of-range IPs wrap to 32 bits whether or not cffi is in use
+    saved_cffi = sauron_module.cffi
+    try:
+        for cffi_module in (saved_cffi, None):
+            sauron_module.cffi = cffi_module
+            with Sauron() as s:
+                assert s.set_u32(-1, 7) == 0
+                assert s.get_u32(0xFFFFFFFF) == 7
+                assert s.incr_u32(2**32 + 1, 3) == 3
+                assert s.decr_u32(1, 1) == 2
+                assert s.get_u32(2**32 - 1) == 7
+                assert s.delete_u32(-1) is True
+                assert s.get_u32(0xFFFFFFFF) == 0
+    finally:
+        sauron_module.cffi = saved_cffi
+
+    print("PASS")
+
+
+def test_batch_operations():
+    """Test batch get/set/incr with NumPy arrays."""
+    print("Testing batch operations...", end=" ")
+
+    if np is None:
+        print("SKIP (NumPy not installed)")
+        return
+
+    with Sauron() as s:
+        ips = np.array([0x0A000001, 0x0A000002, 0x0A000101], dtype=np.uint32)
+
+        count = s.set_batch(ips, [100, -200, 300])
+        assert count == 3, f"Expected 3 sets, got {count}"
+        assert s.get_u32(0x0A000002) == -200
+
+        count = s.incr_batch(ips, np.array([10, 20, -30]))
+        assert count == 3, f"Expected 3 increments, got {count}"
+
+        scores = s.get_batch(ips)
+        assert scores.dtype == np.int16
+        assert scores.tolist() == [110, -180, 270], f"Got {scores.tolist()}"
+
+        # Reuse a caller-provided output buffer
+        out = np.zeros(3, dtype=np.int16)
+        assert s.get_batch(ips, out) is out
+        assert out.tolist() == [110, -180, 270]
+
+        # Batch calls are counted per IP, scalar calls are not
+        s.get_u32(0x0A000001)
+        counters = s.counters()
+        assert counters == {'reads': 6, 'writes': 6}, f"Got {counters}"
+
+        # Scores are validated like the scalar API
+        try:
+            s.set_batch(ips, [1, 2, 40000])
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+
+        try:
+            s.set_batch(ips, [1, 2])
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+
+        # Wider IP arrays are range-checked, not truncated to 32 bits
+        wide = ips.astype(np.int64)
+        assert s.get_batch(wide).tolist() == [110, -180, 270]
+        for bad, error in ((np.array([2**32 + 1], dtype=np.int64), ValueError),
+                           (np.array([-1], dtype=np.int64), ValueError),
+                           (np.array([1.0]), TypeError)):
+            try:
+                s.get_batch(bad)
+                assert False, f"{bad!r} should have raised {error.__name__}"
+            except error:
+                pass
+
+    print("PASS")
+
+
+def test_batch_array_module():
+    """Test batch get/set/incr with array.array buffers."""
+    print("Testing batch operations with array.array...", end=" ")
+
+    ips = array.array('I', [0x0A000001, 0x0A000002, 0x0A000101])
+
+    # Run once as given, then again with the NumPy-free fallback path
+    saved_np = sauron_module.np
+    try:
+        for numpy_module in (saved_np, None):
+            sauron_module.np = numpy_module
+            with Sauron() as s:
+                assert s.set_batch(ips, array.array('h', [100, -200, 300])) == 3
+                assert s.incr_batch(ips, [10, 20, -30]) == 3
+
+                out = array.array('h', [0, 0, 0])
+                s.get_batch(ips, out)
+                assert out.tolist() == [110, -180, 270], f"Got {out.tolist()}"
+                assert list(s.get_batch(ips)) == [110, -180, 270]
+
+                # Out-of-range values still raise
+                for bad in ([1, 2, 40000], array.array('h', [1, 2, -32768])):
+                    try:
+                        s.set_batch(ips, bad)
+                        assert False, "Should have raised ValueError"
+                    except ValueError:
+                        pass
+    finally:
+        sauron_module.np = saved_np
+
+    print("PASS")
+
+
+def test_count_and_apply():
+    """Test count_and_apply() against per-event incr_u32() calls."""
+    print("Testing count_and_apply...", end=" ")
+
+    events = [1, 2, 1, 3, 1, 2] + [4] * 3 + [5] * 2
+    saved_np = sauron_module.np
+    try:
+        for numpy_module in (saved_np, None):
+            sauron_module.np = numpy_module
+            for delta in (1, -7, 30000, -30000):
+                with Sauron() as batched, Sauron() as scalar:
+                    for engine in (batched, scalar):
+                        engine.set_u32(4, -32767)
+                        engine.set_u32(5, 32767)
+
+                    assert batched.count_and_apply(events, delta) == 5
+                    for ip in events:
+                        scalar.incr_u32(ip, delta)
+
+                    expected = [scalar.get_u32(ip) for ip in range(1, 6)]
+                    got = [batched.get_u32(ip) for ip in range(1, 6)]
+                    assert got == expected, f"delta {delta}: {got} != {expected}"
+
+            with Sauron() as s:
+                assert s.count_and_apply([], 1) == 0
+                assert s.count_and_apply(events, 0) == 0
+                try:
+                    s.count_and_apply(events, 40000)
+                    assert False, "Should have raised ValueError"
+                except ValueError:
+                    pass
+    finally:
+        sauron_module.np = saved_np
+
+    print("PASS")
+
+
+def test_snapshot():
+    """Test snapshot() and writing transformed scores back."""
+    print("Testing snapshot...", end=" ")
+
+    saved_np = sauron_module.np
+    try:
+        for numpy_module in (saved_np, None):
+            sauron_module.np = numpy_module
+            with Sauron() as s:
+                ips, scores = s.snapshot()
+                assert len(ips) == 0 and len(scores) == 0
+
+                s.set("10.0.1.1", 400)
+                s.set("10.0.0.1", -100)
+                s.set("192.168.1.1", 32767)
+
+                ips, scores = s.snapshot()
+                assert list(ips) == [0x0A000001, 0x0A000101, 0xC0A80101]
+                assert list(scores) == [-100, 400, 32767], f"Got {list(scores)}"
+
+                # Halve every score and write them back in one call
+                halved = [value // 2 for value in scores]
+                assert s.set_batch(ips, halved) == 3
+                assert s.get("10.0.1.1") == 200
+                assert s.get("192.168.1.1") == 16383
+    finally:
+        sauron_module.np = saved_np
+
+    print("PASS")
+
+
+def test_format_bulk_csv():
+    """Test C-side CSV formatting feeding bulk_load_buffer."""
+    print("Testing bulk CSV formatting...", end=" ")
+
+    if np is None:
+        print("SKIP (NumPy not installed)")
+        return
+
+    with Sauron() as s:
+        ips = np.array([0x0A000001, 0xC0A80102, 0x01020304], dtype=np.uint32)
+        data = s.format_bulk_csv(ips, [7, 250, -5], [False, True, True])
+        assert data == b"10.0.0.1,7\n192.168.1.2,+250\n1.2.3.4,+-5\n", f"Got {data!r}"
+
+        # Formatting into a reused buffer only writes whole lines
+        buf = bytearray(40)
+        n = s.format_bulk_csv_into(buf, ips, [7, 250, -5])
+        assert bytes(buf[:n]) == b"10.0.0.1,7\n192.168.1.2,250\n", f"Got {bytes(buf[:n])!r}"
+
+        s.set_u32(0x01020304, 10)
+        result = s.bulk_load_buffer(data)
+        assert result.sets == 1 and result.updates == 2
+        assert s.get_u32(0x0A000001) == 7
+        assert s.get_u32(0xC0A80102) == 250
+        assert s.get_u32(0x01020304) == 5
+
+    print("PASS")
+
+
+def test_bulk_load_buffer():
+    """Test bulk loading from string and bytes-like buffers."""
+    print("Testing bulk load buffers...", end=" ")
+
+    with Sauron() as s:
+        result = s.bulk_load_string("10.1.0.1,100\n10.1.0.2,+20\n# comment\n")
+        assert result.lines_processed == 3, f"Got {result}"
+        assert result.sets == 1 and result.updates == 1
+        assert s.get("10.1.0.1") == 100
+
+        result = s.bulk_load_buffer(b"10.1.0.1,+-30\n")
+        assert result.updates == 1 and s.get("10.1.0.1") == 70
+
+        result = s.bulk_load_string(b"10.1.0.1,+5\n")
+        assert result.updates == 1 and s.get("10.1.0.1") == 75
+
+        # Only the viewed slice of a reused buffer is parsed
+        buf = bytearray(b"10.1.0.3,5\n10.1.0.4,6\n")
+        result = s.bulk_load_buffer(memoryview(buf)[:11])
+        assert result.sets == 1
+        assert s.get("10.1.0.3") == 5 and s.get("10.1.0.4") == 0
+
+        result = s.bulk_load_buffer(buf)
+        assert result.sets == 2 and s.get("10.1.0.4") == 6
+
+        result = s.bulk_load_buffer(b"")
+        assert result.lines_processed == 0
+
+        # Row filters can rewrite or drop entries before they are applied
+        def halve_skip_net2(ip, value, is_relative):
+            if ip >> 8 == 0x0A0102:
+                return None
+            return value // 2
+
+        s.clear()
+        result = s.bulk_load_string("10.1.0.1,100\n10.1.2.1,100\n10.1.0.2,+30\n",
+                                    halve_skip_net2)
+        assert result.sets == 1 and result.updates == 1 and result.lines_skipped == 1
+        assert s.get("10.1.0.1") == 50 and s.get("10.1.2.1") == 0
+        assert s.get("10.1.0.2") == 15
+
+        try:
+            s.bulk_load_buffer(b"10.1.0.3,1\n", lambda ip, value, rel: 40000)
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+        assert s.get("10.1.0.3") == 0
+
+    print("PASS")
+
+
+def test_bulk_load_filters():
+    """Test row filters on file loads and compiled C callbacks."""
+    print("Testing bulk load row filters...", end=" ")
+
+    def skip_net2_double(ip, value, is_relative):
+        if ip >> 8 == 0x0A0102:
+            return None
+        return value * 2
+
+    # A C-signature callback, as a Numba @cfunc would provide
+    @sauron_module._BulkFilterFunc
+    def c_filter(ip, value, is_relative, user_data):
+        if ip >> 8 == 0x0A0102:
+            return 0
+        value[0] = value[0] * 2
+        return 1
+
+    addressed = types.SimpleNamespace(address=ctypes.cast(c_filter, ctypes.c_void_p).value)
+    data = "10.1.0.1,100\n10.1.2.1,100\n10.1.0.2,+30\n"
+
+    with tempfile.NamedTemporaryFile('w', delete=False, suffix='.csv') as f:
+        f.write(data)
+        name = f.name
+    try:
+        with Sauron() as s:
+            for row_filter in (skip_net2_double, c_filter, addressed):
+                for load in (s.bulk_load, s.bulk_load_string):
+                    s.clear()
+                    result = load(name if load == s.bulk_load else data, row_filter)
+                    assert result.sets == 1 and result.updates == 1, f"Got {result}"
+                    assert result.lines_skipped == 1
+                    assert s.get("10.1.0.1") == 200 and s.get("10.1.2.1") == 0
+                    assert s.get("10.1.0.2") == 60
+
+            # Python filter errors surface from file loads too
+            def fail(ip, value, is_relative):
+                raise RuntimeError("filter failed")
+
+            try:
+                s.bulk_load(name, fail)
+                assert False, "Should have raised RuntimeError"
+            except RuntimeError:
+                pass
+
+            try:
+                s.bulk_load(name, 42)
+                assert False, "Should have raised TypeError"
+            except TypeError:
+                pass
+    finally:
+        os.unlink(name)
+
+    print("PASS")
+
+
+def test_bulk_load_parallel():
+    """Test loading several bulk files concurrently."""
+    print("Testing parallel bulk load...", end=" ")
+
+    shards = []
+    try:
+        for net in range(4):
+            with tempfile.NamedTemporaryFile('w', delete=False, suffix='.csv') as f:
+                for host in range(1, 101):
+                    f.write(f"{10 + net}.0.0.{host},{net + 1}\n")
+                f.write("bogus\n")
+                shards.append(f.name)
+
+        with Sauron() as s:
+            result = s.bulk_load_parallel(shards, max_workers=2)
+            assert result.lines_processed == 404, f"Got {result}"
+            assert result.sets == 400 and result.parse_errors == 4
+            assert s.count() == 400
+            assert s.get("13.0.0.100") == 4
+
+            try:
+                s.bulk_load_parallel(shards + ["/nonexistent/file.csv"])
+                assert False, "Should have raised SauronIOError"
+            except SauronIOError:
+                pass
+    finally:
+        for name in shards:
+            os.unlink(name)
+
     print("PASS")
 
 
@@ -178,10 +552,17 @@ def test_ip_conversion():
     assert Sauron.ip_to_u32("255.255.255.255") == 0xFFFFFFFF
     assert Sauron.ip_to_u32("invalid") == 0
     assert Sauron.ip_to_u32("256.1.1.1") == 0
+    assert Sauron.ip_to_u32("010.0.0.1") == 0x0A000001
+
+    many = Sauron.ip_to_u32_many(["192.168.1.1", "10.0.0.1"])
+    assert list(many) == [0xC0A80101, 0x0A000001], f"Got {list(many)}"
+    many = Sauron.ip_to_u32_many(["1.2.3.4", "bogus", "010.0.0.1"])
+    assert list(many) == [0x01020304, 0, 0x0A000001], f"Got {list(many)}"
 
     # u32 to string
     assert Sauron.u32_to_ip(0xC0A80101) == "192.168.1.1"
     assert Sauron.u32_to_ip(0x0A000001) == "10.0.0.1"
+    assert Sauron.u32_to_ip_many([0xC0A80101, 0xFFFFFFFF]) == ["192.168.1.1", "255.255.255.255"]
 
     print("PASS")
 
@@ -204,6 +585,23 @@ def test_context_manager():
     except SauronError:
         pass  # Expected
 
+    for call in (lambda: s.set("10.0.0.1", 1), lambda: s.delete(b"10.0.0.1"),
+                 lambda: s.get_u32(1), lambda: s.incr_u32(1, 1),
+                 lambda: s.format_bulk_csv([1], [1]),
+                 lambda: s.format_bulk_csv_into(bytearray(64), [1], [1])):
+        try:
+            call()
+            assert False, "Should have raised SauronError"
+        except SauronError:
+            pass
+
+    # Dropping an engine without close() still destroys its context
+    dropped = Sauron()
+    dropped.set("10.0.0.1", 100)
+    finalizer = dropped._finalizer
+    del dropped
+    assert not finalizer.alive, "Context should be destroyed on collection"
+
     print("PASS")
 
 
@@ -276,6 +674,14 @@ def main():
     test_basic_operations()
     test_saturation()
     test_u32_operations()
+    test_batch_operations()
+    test_batch_array_module()
+    test_count_and_apply()
+    test_snapshot()
+    test_bulk_load_buffer()
+    test_bulk_load_filters()
+    test_format_bulk_csv()
+    test_bulk_load_parallel()
     test_decay()
     test_statistics()
     test_persistence()